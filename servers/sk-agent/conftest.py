@@ -0,0 +1,41 @@
+"""
+Pytest configuration for the sk-agent tests.
+
+Makes the server modules (sk_agent, sk_agent_config, ...) importable from
+the tests (once, at collection), registers the custom markers and provides
+the guard used by fixtures whose value is shared between tests.
+"""
+
+import copy
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "unit: fast, pure tests with no I/O (select with -m unit)"
+    )
+    config.addinivalue_line(
+        "markers", "functional: tests that call real models and MCP servers"
+    )
+
+
+@pytest.fixture(scope="session")
+def check_unmutated():
+    """Guard for shared fixture values: fails teardown if a test changed one.
+
+    Usage in a fixture: ``with check_unmutated(config, "name"): yield config``.
+    """
+
+    @contextmanager
+    def check(value, name: str):
+        snapshot = copy.deepcopy(value)
+        yield
+        assert value == snapshot, f"{name} was mutated by a test"
+
+    return check
@@ -6,22 +6,31 @@ Handles conversion and extraction from various document formats:
 - PDF: PyMuPDF or pdf2image for images, PyMuPDF for text
 - PPT/PPTX: LibreOffice → PDF → images, or text extraction
 - DOC/DOCX: LibreOffice → PDF → images, or python-docx for text
-- XLS/XLSX: LibreOffice → PDF → images, or pandas for CSV
+- XLS/XLSX: LibreOffice → PDF → images (openpyxl cell drawing without it),
+  or pandas for CSV
 
 Provides a unified PageContent interface for flexible document analysis.
 """
 
 from __future__ import annotations
 
+import atexit
+import datetime
 import io
 import logging
+import multiprocessing
 import os
+import re
 import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
 from PIL import Image
 
@@ -57,6 +66,24 @@ TOKENS_PER_TEXT_PAGE = 800  # Average text page
 TOKENS_PER_IMAGE_PAGE = 1500  # Image encoded as base64 + context
 SAFETY_MARGIN = 0.8  # Use 80% of context to leave room for prompt/response
 
+# Render PDF pages in a process pool from this many pages on. A page takes
+# ~140 ms at DPI 180 against ~1.5 ms for a round trip to the warm pool, so
+# two pages already pay off; the pool's start-up is paid once per process.
+PARALLEL_RENDER_MIN_PAGES = 2
+# Upper bound on render workers: each one stays alive for the process lifetime
+PARALLEL_RENDER_MAX_WORKERS = 4
+
+# Put LibreOffice output on /dev/shm when it has at least this much free space
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_FREE_BYTES = 512 * 1024 * 1024
+
+# Bounds for drawing a sheet directly from openpyxl cell values (no LibreOffice)
+SHEET_RENDER_MAX_ROWS = 200
+SHEET_RENDER_MAX_COLS = 30
+SHEET_RENDER_MAX_CELL_CHARS = 40
+# Pixel size of the text; close to a 10 pt cell on LibreOffice's 180 DPI page
+SHEET_RENDER_FONT_SIZE = 24
+
 
 # ---------------------------------------------------------------------------
 # Document Processing Types
@@ -65,7 +92,7 @@ SAFETY_MARGIN = 0.8  # Use 80% of context to leave room for prompt/response
 DocumentAnalysisMode = Literal["visual", "text", "hybrid"]
 
 
-@dataclass
+@dataclass(slots=True)
 class PageContent:
     """Unified page content that can hold image and/or text.
 
@@ -100,7 +127,7 @@ class PageContent:
         return max(tokens, 100)  # Minimum 100 tokens per page
 
 
-@dataclass
+@dataclass(slots=True)
 class PageRange:
     """Optional page range for document extraction."""
 
@@ -122,14 +149,32 @@ class PageRange:
 # ---------------------------------------------------------------------------
 
 
+# (LIBREOFFICE_PATH, portable paths) -> discovered executable. Only hits are
+# cached, so an install made after a miss is still picked up.
+_LIBREOFFICE_CACHE: dict[tuple[str | None, tuple[str, ...]], str] = {}
+
+
 def _find_libreoffice() -> str | None:
     """Find LibreOffice executable in system PATH or common portable locations.
 
+    The result is cached per configured path, so conversions after the first
+    skip the PATH and filesystem probes.
+
     Returns:
         Path to LibreOffice executable (soffice.exe or LibreOfficePortable.exe) or None
     """
-    global LIBREOFFICE_PATH
+    key = (LIBREOFFICE_PATH, tuple(LIBREOFFICE_PORTABLE_PATHS))
+    cached = _LIBREOFFICE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    found = _discover_libreoffice()
+    if found:
+        _LIBREOFFICE_CACHE[key] = found
+    return found
+
 
+def _discover_libreoffice() -> str | None:
     # 1. Check custom path set via config/install tool
     if LIBREOFFICE_PATH and Path(LIBREOFFICE_PATH).exists():
         log.info("Using configured LibreOffice path: %s", LIBREOFFICE_PATH)
@@ -163,17 +208,152 @@ def set_libreoffice_path(path: str) -> bool:
     global LIBREOFFICE_PATH
     if Path(path).exists():
         LIBREOFFICE_PATH = path
+        _LIBREOFFICE_CACHE.clear()
         log.info("Set LibreOffice path to: %s", path)
         return True
     log.warning("LibreOffice path does not exist: %s", path)
     return False
 
 
+def _conversion_tmp_dir(prefix: str) -> str:
+    """Create a temp directory for LibreOffice output, in RAM when possible.
+
+    Uses /dev/shm (tmpfs) on Linux unless it is missing or nearly full
+    (Docker defaults it to 64 MB); otherwise the system temp directory.
+    """
+    tmp_root = None
+    try:
+        if shutil.disk_usage(SHM_DIR).free >= SHM_MIN_FREE_BYTES:
+            tmp_root = str(SHM_DIR)
+    except OSError:
+        pass
+    return tempfile.mkdtemp(prefix=prefix, dir=tmp_root)
+
+
+def _convert_with_libreoffice(
+    libreoffice_cmd: str,
+    input_path: str,
+    target: str,
+    out_dir: str,
+) -> None:
+    """Run ``soffice --headless --convert-to <target>``, writing into ``out_dir``.
+
+    Single entry point for every LibreOffice conversion in this module.
+
+    Raises:
+        RuntimeError: If LibreOffice fails or times out (>120s)
+    """
+    try:
+        result = subprocess.run(
+            [
+                libreoffice_cmd,
+                "--headless",
+                "--convert-to",
+                target,
+                "--outdir",
+                out_dir,
+                input_path,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=120,  # 2 minute timeout
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("LibreOffice conversion timed out (>120s)")
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        raise RuntimeError(f"LibreOffice conversion failed: {stderr}")
+
+
 # ---------------------------------------------------------------------------
 # PDF Processing
 # ---------------------------------------------------------------------------
 
 
+def _render_fitz_page(page: Any) -> bytes:
+    """Render a PyMuPDF page to PNG bytes at DPI 180 (matches GLM-V gradio)."""
+    return page.get_pixmap(dpi=180).tobytes("png")  # PNG for lossless quality
+
+
+def _init_render_worker() -> None:
+    """Process-pool initializer: load PyMuPDF once per worker."""
+    import fitz  # noqa: F401  PyMuPDF
+
+
+def _render_pdf_pages(pdf_path: str, page_indices: list[int]) -> list[bytes]:
+    """Process-pool worker: open ``pdf_path`` once and render a run of pages."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        return [_render_fitz_page(doc[i]) for i in page_indices]
+
+
+_render_pool: ProcessPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
+
+
+def _render_worker_count() -> int:
+    """CPUs this process may run on (not the host's), capped."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Windows, macOS
+        cpus = os.cpu_count() or 1
+    return min(cpus, PARALLEL_RENDER_MAX_WORKERS)
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Process pool for PDF rendering, started on first use and kept.
+
+    Workers come from a fork server where available, so they are never forked
+    from the threaded server process; elsewhere they are spawned.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _render_pool = ProcessPoolExecutor(
+                max_workers=_render_worker_count(),
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_render_worker,
+            )
+            atexit.register(_shutdown_render_pool)
+        return _render_pool
+
+
+def _shutdown_render_pool() -> None:
+    """Stop the PDF rendering pool; the next render starts a new one."""
+    global _render_pool
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _render_pdf_pages_parallel(
+    pdf_path: str, page_indices: range, workers: int
+) -> list[bytes]:
+    """Render pages in the shared pool, one contiguous run of pages per worker.
+
+    If the pool breaks (a worker died), it is reset and the pages are
+    rendered in this process instead.
+    """
+    size = -(-len(page_indices) // workers)
+    chunks = [
+        list(page_indices[i : i + size]) for i in range(0, len(page_indices), size)
+    ]
+    try:
+        results = _get_render_pool().map(
+            _render_pdf_pages, [pdf_path] * len(chunks), chunks
+        )
+        return [img for chunk in results for img in chunk]
+    except BrokenProcessPool as e:
+        log.warning("PDF render pool broke (%s), rendering in process", e)
+        _shutdown_render_pool()
+        return _render_pdf_pages(pdf_path, list(page_indices))
+
+
 def _pdf_to_images(
     pdf_path: str,
     max_pages: int = 10,
@@ -207,16 +387,21 @@ def _pdf_to_images(
         # Clamp to actual pages
         first_page = max(1, min(first_page, page_count))
         last_page = min(last_page, page_count)
+        page_indices = range(first_page - 1, last_page)
 
-        for page_idx in range(first_page - 1, last_page):
-            page = doc[page_idx]
-            # Render page to image at DPI 180 (matches GLM-V gradio)
-            pix = page.get_pixmap(dpi=180)
-            img_data = pix.tobytes("png")  # PNG for lossless quality
+        workers = min(_render_worker_count(), len(page_indices))
+        if len(page_indices) >= PARALLEL_RENDER_MIN_PAGES and workers > 1:
+            # PNG encoding is CPU-bound: spread pages over processes
+            doc.close()
+            rendered = _render_pdf_pages_parallel(pdf_path, page_indices, workers)
+        else:
+            rendered = [_render_fitz_page(doc[i]) for i in page_indices]
+            doc.close()
+
+        for page_idx, img_data in zip(page_indices, rendered):
             images.append((img_data, "image/png"))
             log.info("Converted PDF page %d to PNG (PyMuPDF, DPI=180)", page_idx + 1)
 
-        doc.close()
         log.info("Converted %d pages from PDF: %s", len(images), pdf_path)
         return images
     except ImportError:
@@ -233,7 +418,8 @@ def _pdf_to_images(
         )
         for i, page in enumerate(pages):
             buf = io.BytesIO()
-            page.save(buf, format="PNG")  # PNG for lossless quality
+            # Lossless either way; level 1 encodes ~30% faster than the default 6
+            page.save(buf, format="PNG", compress_level=1)
             images.append((buf.getvalue(), "image/png"))
             log.info(
                 "Converted PDF page %d to PNG (pdf2image, DPI=180)", first_page + i
@@ -283,28 +469,10 @@ def _ppt_to_images(
         )
 
     # Create temp directory for conversion
-    tmp_dir = tempfile.mkdtemp(prefix="ppt_convert_")
-    pdf_path = None
-
+    tmp_dir = _conversion_tmp_dir("ppt_convert_")
     try:
         # Convert PPT to PDF using LibreOffice headless
-        result = subprocess.run(
-            [
-                libreoffice_cmd,
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                tmp_dir,
-                ppt_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2 minute timeout
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+        _convert_with_libreoffice(libreoffice_cmd, ppt_path, "pdf", tmp_dir)
 
         # Find the generated PDF
         ppt_stem = Path(ppt_path).stem
@@ -322,12 +490,8 @@ def _ppt_to_images(
         log.info("Converted %d slides from PPT: %s", len(images), ppt_path)
         return images
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("LibreOffice conversion timed out (>120s)")
     finally:
-        # Cleanup temp directory
-        if pdf_path and pdf_path.parent.exists():
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 # ---------------------------------------------------------------------------
@@ -364,28 +528,10 @@ def _doc_to_text(doc_path: str) -> str:
             "Use install_libreoffice tool or install from: https://www.libreoffice.org/download/"
         )
 
-    tmp_dir = tempfile.mkdtemp(prefix="doc_convert_")
-    txt_path = None
-
+    tmp_dir = _conversion_tmp_dir("doc_convert_")
     try:
         # Convert DOC to TXT using LibreOffice headless
-        result = subprocess.run(
-            [
-                libreoffice_cmd,
-                "--headless",
-                "--convert-to",
-                "txt:Text",
-                "--outdir",
-                tmp_dir,
-                doc_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+        _convert_with_libreoffice(libreoffice_cmd, doc_path, "txt:Text", tmp_dir)
 
         # Find the generated TXT file
         doc_stem = Path(doc_path).stem
@@ -406,11 +552,8 @@ def _doc_to_text(doc_path: str) -> str:
         log.info("Converted DOC to text: %s (%d chars)", doc_path, len(text))
         return text
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("LibreOffice conversion timed out (>120s)")
     finally:
-        if txt_path and txt_path.parent.exists():
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def _doc_to_images(
@@ -437,28 +580,10 @@ def _doc_to_images(
             "Use install_libreoffice tool or install from: https://www.libreoffice.org/download/"
         )
 
-    tmp_dir = tempfile.mkdtemp(prefix="doc_convert_")
-    pdf_path = None
-
+    tmp_dir = _conversion_tmp_dir("doc_convert_")
     try:
         # Convert DOC to PDF using LibreOffice headless
-        result = subprocess.run(
-            [
-                libreoffice_cmd,
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                tmp_dir,
-                doc_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+        _convert_with_libreoffice(libreoffice_cmd, doc_path, "pdf", tmp_dir)
 
         # Find the generated PDF
         doc_stem = Path(doc_path).stem
@@ -476,11 +601,8 @@ def _doc_to_images(
         log.info("Converted %d pages from Word document: %s", len(images), doc_path)
         return images
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("LibreOffice conversion timed out (>120s)")
     finally:
-        if pdf_path and pdf_path.parent.exists():
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 # ---------------------------------------------------------------------------
@@ -504,12 +626,10 @@ def _xlsx_to_csv(xlsx_path: str, max_sheets: int = 10) -> list[tuple[str, str]]:
     try:
         import pandas as pd
 
-        # Read all sheets
-        xlsx = pd.ExcelFile(xlsx_path)
-        for i, sheet_name in enumerate(xlsx.sheet_names):
-            if i >= max_sheets:
-                break
-            df = pd.read_excel(xlsx, sheet_name=sheet_name)
+        # Parse the workbook once and read the wanted sheets in one call
+        with pd.ExcelFile(xlsx_path) as xlsx:
+            frames = pd.read_excel(xlsx, sheet_name=xlsx.sheet_names[:max_sheets])
+        for sheet_name, df in frames.items():
             csv_content = df.to_csv(index=False)
             sheets.append((sheet_name, csv_content))
             log.info("Converted sheet '%s' to CSV (%d rows)", sheet_name, len(df))
@@ -530,28 +650,10 @@ def _xlsx_to_csv(xlsx_path: str, max_sheets: int = 10) -> list[tuple[str, str]]:
             "Install with: pip install pandas openpyxl"
         )
 
-    tmp_dir = tempfile.mkdtemp(prefix="xlsx_convert_")
-    csv_path = None
-
+    tmp_dir = _conversion_tmp_dir("xlsx_convert_")
     try:
         # Convert XLSX to CSV using LibreOffice headless
-        result = subprocess.run(
-            [
-                libreoffice_cmd,
-                "--headless",
-                "--convert-to",
-                "csv",
-                "--outdir",
-                tmp_dir,
-                xlsx_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+        _convert_with_libreoffice(libreoffice_cmd, xlsx_path, "csv", tmp_dir)
 
         # Find generated CSV files (one per sheet)
         for csv_file in sorted(Path(tmp_dir).glob("*.csv"))[:max_sheets]:
@@ -564,11 +666,189 @@ def _xlsx_to_csv(xlsx_path: str, max_sheets: int = 10) -> list[tuple[str, str]]:
         log.info("Converted %d sheets from Excel: %s", len(sheets), xlsx_path)
         return sheets
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("LibreOffice conversion timed out (>120s)")
     finally:
-        if csv_path and csv_path.parent.exists():
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _format_cell(value: Any, number_format: str = "General") -> str:
+    """Display text for a cell value under the common Excel number formats.
+
+    Covers General, fixed decimals, thousands separators, percentages,
+    scientific notation and dates/times; other formats show the plain value.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time():
+            return value.date().isoformat()
+        timespec = "seconds" if value.second else "minutes"
+        return value.isoformat(sep=" ", timespec=timespec)
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return str(value)
+    if not isinstance(value, (int, float)):
+        return str(value)
+
+    section = number_format.split(";")[0]
+    if section in ("General", "@", ""):
+        return f"{value:.11g}" if isinstance(value, float) else str(value)
+    match = re.search(r"\.(0+)", section)
+    decimals = len(match.group(1)) if match else 0
+    if "%" in section:
+        return f"{value * 100:.{decimals}f}%"
+    if "E+" in section.upper():
+        return f"{value:.{decimals}E}"
+    separator = "," if "#,##" in section else ""
+    return f"{value:{separator}.{decimals}f}"
+
+
+def _sheet_cell_text(value: Any, number_format: str = "General") -> str:
+    """Formatted cell text, cut to SHEET_RENDER_MAX_CELL_CHARS with '...'."""
+    text = _format_cell(value, number_format)
+    if len(text) > SHEET_RENDER_MAX_CELL_CHARS:
+        return text[: SHEET_RENDER_MAX_CELL_CHARS - 3] + "..."
+    return text
+
+
+def _render_sheet_to_png(
+    sheet_name: str,
+    rows: list[list[str]],
+    more_rows: int = 0,
+    more_cols: int = 0,
+) -> bytes:
+    """Draw a sheet title and its cell values as a plain grid PNG.
+
+    Rows and columns left out of ``rows`` are counted in a note under the grid.
+    The default font only covers Latin-1: callers check the text first.
+    """
+    from PIL import ImageDraw, ImageFont
+
+    font = ImageFont.load_default(size=SHEET_RENDER_FONT_SIZE)
+    pad = SHEET_RENDER_FONT_SIZE // 3
+    row_height = font.getbbox("Ag")[3] + 2 * pad
+    n_cols = max((len(row) for row in rows), default=0)
+    col_widths = [
+        int(max((font.getlength(row[c]) for row in rows if c < len(row)), default=0))
+        + 2 * pad
+        for c in range(n_cols)
+    ]
+    notes = []
+    if more_rows:
+        notes.append(f"{more_rows} more rows")
+    if more_cols:
+        notes.append(f"{more_cols} more columns")
+    footer = "... " + " / ".join(notes) if notes else ""
+
+    width = max(
+        sum(col_widths),
+        int(font.getlength(sheet_name)) + 2 * pad,
+        int(font.getlength(footer)) + 2 * pad,
+    ) + 1
+    height = row_height * (len(rows) + 1 + bool(footer)) + 1
+
+    img = Image.new("RGB", (width, height), color="white")
+    draw = ImageDraw.Draw(img)
+    draw.text((pad, pad), sheet_name, fill="black", font=font)
+    for r, row in enumerate(rows, start=1):
+        y = r * row_height
+        x = 0
+        for c, col_width in enumerate(col_widths):
+            draw.rectangle(
+                (x, y, x + col_width, y + row_height), outline="#b0b0b0"
+            )
+            if c < len(row):
+                draw.text((x + pad, y + pad), row[c], fill="black", font=font)
+            x += col_width
+    if footer:
+        draw.text(
+            (pad, (len(rows) + 1) * row_height + pad), footer, fill="#c00000", font=font
+        )
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def _is_latin1(text: str) -> bool:
+    try:
+        text.encode("latin-1")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _xlsx_cells_to_images(
+    xlsx_path: str,
+    max_sheets: int,
+    start_sheet: int,
+) -> list[tuple[bytes, str]]:
+    """Draw each sheet's formatted cell values as a grid (no LibreOffice).
+
+    Charts and pictures are not drawn. Formulas without a cached value
+    (workbooks written by openpyxl or pandas) show as their formula text.
+
+    Raises:
+        ImportError: openpyxl is not installed.
+        ValueError: a sheet has text the default font cannot draw.
+    """
+    import openpyxl
+
+    values_wb = openpyxl.load_workbook(xlsx_path, data_only=True)
+    formulas_wb = openpyxl.load_workbook(xlsx_path)
+    try:
+        images = []
+        sheets = zip(values_wb.worksheets, formulas_wb.worksheets)
+        for ws, formulas in islice(sheets, start_sheet, start_sheet + max_sheets):
+            bounds = {
+                "max_row": min(ws.max_row, SHEET_RENDER_MAX_ROWS),
+                "max_col": min(ws.max_column, SHEET_RENDER_MAX_COLS),
+            }
+            rows = []
+            uncached = 0
+            for cells, formula_cells in zip(
+                ws.iter_rows(**bounds), formulas.iter_rows(**bounds)
+            ):
+                row = []
+                for cell, formula_cell in zip(cells, formula_cells):
+                    if cell.value is None and formula_cell.data_type == "f":
+                        uncached += 1
+                        # ArrayFormula keeps its text in .text
+                        formula = formula_cell.value
+                        formula = getattr(formula, "text", formula)
+                        row.append(_sheet_cell_text(str(formula)))
+                    else:
+                        row.append(_sheet_cell_text(cell.value, cell.number_format))
+                rows.append(row)
+            if not all(_is_latin1(text) for text in chain([ws.title], *rows)):
+                raise ValueError(f"sheet '{ws.title}' has non-Latin-1 text")
+            if uncached:
+                log.warning(
+                    "Sheet '%s': %d formulas have no cached value, showing formulas",
+                    ws.title,
+                    uncached,
+                )
+
+            more_rows = max(ws.max_row - SHEET_RENDER_MAX_ROWS, 0)
+            more_cols = max(ws.max_column - SHEET_RENDER_MAX_COLS, 0)
+            if more_rows or more_cols:
+                log.warning(
+                    "Sheet '%s' cut to %d rows x %d columns (%d more rows, "
+                    "%d more columns not shown)",
+                    ws.title,
+                    bounds["max_row"],
+                    bounds["max_col"],
+                    more_rows,
+                    more_cols,
+                )
+            png = _render_sheet_to_png(ws.title, rows, more_rows, more_cols)
+            images.append((png, "image/png"))
+    finally:
+        values_wb.close()
+        formulas_wb.close()
+
+    log.info("Rendered %d sheets from Excel cell values: %s", len(images), xlsx_path)
+    return images
 
 
 def _xlsx_to_images(
@@ -576,9 +856,13 @@ def _xlsx_to_images(
     max_sheets: int = 10,
     start_sheet: int = 0,
 ) -> list[tuple[bytes, str]]:
-    """Convert Excel spreadsheet sheets to images using LibreOffice.
+    """Convert Excel spreadsheet sheets to images using LibreOffice or openpyxl.
 
-    Converts via: XLS/XLSX → PDF → Images (each sheet becomes a page).
+    Converts via XLS/XLSX → PDF → Images (each sheet becomes a page). When
+    LibreOffice is not installed, XLSX sheets are drawn from their formatted
+    cell values instead (see _xlsx_cells_to_images), at most
+    SHEET_RENDER_MAX_ROWS x SHEET_RENDER_MAX_COLS cells with a note counting
+    the rest.
 
     Args:
         xlsx_path: Path to the XLS/XLSX file
@@ -590,33 +874,23 @@ def _xlsx_to_images(
     """
     libreoffice_cmd = _find_libreoffice()
     if not libreoffice_cmd:
+        # openpyxl cannot read .xls
+        if Path(xlsx_path).suffix.lower() != ".xls":
+            try:
+                return _xlsx_cells_to_images(xlsx_path, max_sheets, start_sheet)
+            except ImportError:
+                log.debug("openpyxl not available to draw cell values")
+            except ValueError as e:
+                log.info("Cannot draw cell values: %s", e)
         raise RuntimeError(
             "Excel visual conversion requires LibreOffice. "
             "Use install_libreoffice tool or install from: https://www.libreoffice.org/download/"
         )
 
-    tmp_dir = tempfile.mkdtemp(prefix="xlsx_convert_")
-    pdf_path = None
-
+    tmp_dir = _conversion_tmp_dir("xlsx_convert_")
     try:
         # Convert XLSX to PDF using LibreOffice headless
-        result = subprocess.run(
-            [
-                libreoffice_cmd,
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                tmp_dir,
-                xlsx_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
+        _convert_with_libreoffice(libreoffice_cmd, xlsx_path, "pdf", tmp_dir)
 
         # Find the generated PDF
         xlsx_stem = Path(xlsx_path).stem
@@ -634,11 +908,8 @@ def _xlsx_to_images(
         log.info("Converted %d sheets from Excel: %s", len(images), xlsx_path)
         return images
 
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("LibreOffice conversion timed out (>120s)")
     finally:
-        if pdf_path and pdf_path.parent.exists():
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 # ---------------------------------------------------------------------------
@@ -701,6 +972,14 @@ def extract_document_pages(
     doc_path = Path(document_path)
     suffix = doc_path.suffix.lower() if doc_path.suffix else ""
 
+    # Route based on document type (each extractor handles the mode)
+    extractor = _PAGE_EXTRACTORS.get(suffix)
+    if extractor is None:
+        raise ValueError(
+            f"Unsupported document format: {suffix}. "
+            f"Supported: PDF, PPT, PPTX, DOC, DOCX, XLS, XLSX"
+        )
+
     # Apply page range if specified
     if page_range:
         start_idx, count = page_range.to_slice(max_pages)
@@ -721,22 +1000,7 @@ def extract_document_pages(
     # Hard limit
     max_pages = min(max_pages, MAX_PAGES_HARD_LIMIT)
 
-    pages: list[PageContent] = []
-
-    # Route based on document type and mode
-    if suffix == ".pdf":
-        pages = _extract_pdf_pages(document_path, mode, max_pages, start_idx)
-    elif suffix in (".ppt", ".pptx"):
-        pages = _extract_ppt_pages(document_path, mode, max_pages, start_idx)
-    elif suffix in (".doc", ".docx"):
-        pages = _extract_doc_pages(document_path, mode, max_pages, start_idx)
-    elif suffix in (".xls", ".xlsx"):
-        pages = _extract_xlsx_pages(document_path, mode, max_pages, start_idx)
-    else:
-        raise ValueError(
-            f"Unsupported document format: {suffix}. "
-            f"Supported: PDF, PPT, PPTX, DOC, DOCX, XLS, XLSX"
-        )
+    pages = extractor(document_path, mode, max_pages, start_idx)
 
     log.info(
         "Extracted %d pages from %s (mode=%s, format=%s, start=%d)",
@@ -765,27 +1029,27 @@ def _extract_pdf_pages(
                 pdf_path, max_pages=max_pages, start_page=start_page
             )
             for i, (img_data, media_type) in enumerate(images):
-                page = PageContent(
-                    page_number=start_page + i + 1,
-                    image_data=img_data,
-                    media_type=media_type,
+                pages.append(
+                    PageContent(
+                        page_number=start_page + i + 1,
+                        image_data=img_data,
+                        media_type=media_type,
+                    )
                 )
 
-                # For hybrid mode, try to extract text too
-                if mode == "hybrid":
-                    try:
-                        import fitz  # PyMuPDF
-
-                        doc = fitz.open(pdf_path)
-                        page_idx = start_page + i
-                        if page_idx < doc.page_count:
-                            text = doc.load_page(page_idx).get_text()
-                            page.text_content = text if text.strip() else None
-                        doc.close()
-                    except Exception:
-                        pass
-
-                pages.append(page)
+            # For hybrid mode, try to extract text too (one open for all pages)
+            if mode == "hybrid" and pages:
+                try:
+                    import fitz  # PyMuPDF
+
+                    with fitz.open(pdf_path) as doc:
+                        for page in pages:
+                            page_idx = page.page_number - 1
+                            if page_idx < doc.page_count:
+                                text = doc.load_page(page_idx).get_text()
+                                page.text_content = text if text.strip() else None
+                except Exception:
+                    pass
         except Exception as e:
             if mode == "visual":
                 raise
@@ -948,3 +1212,17 @@ def _extract_xlsx_pages(
             )
 
     return pages
+
+
+# Document suffix -> page extractor, used by extract_document_pages
+_PAGE_EXTRACTORS: dict[
+    str, Callable[[str, DocumentAnalysisMode, int, int], list[PageContent]]
+] = {
+    ".pdf": _extract_pdf_pages,
+    ".ppt": _extract_ppt_pages,
+    ".pptx": _extract_ppt_pages,
+    ".doc": _extract_doc_pages,
+    ".docx": _extract_doc_pages,
+    ".xls": _extract_xlsx_pages,
+    ".xlsx": _extract_xlsx_pages,
+}
@@ -54,11 +54,11 @@ import sys
 import uuid
 from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import httpx
-from mcp.server.fastmcp import FastMCP
-from openai import AsyncOpenAI
+from mcp.server.fastmcp import Context, FastMCP
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from semantic_kernel import Kernel
 from semantic_kernel.functions import KernelArguments
@@ -103,10 +103,14 @@ from sk_agent_config import (
     McpConfig,
     load_config,
     CONFIG_PATH,
-    SK_AGENT_DEPTH,
     DEFAULT_MAX_RECURSION_DEPTH,
+    get_sk_agent_depth,
+)
+from sk_conversations import (
+    ConversationRunner,
+    ResponseCache,
+    build_run_conversation_description,
 )
-from sk_conversations import ConversationRunner, build_run_conversation_description
 
 # GitHub PR review plugin
 try:
@@ -140,6 +144,14 @@ except ImportError:
     except ImportError:
         HAS_QDRANT = False
 
+# Optional: faster serialization of large conversation results
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -385,6 +397,7 @@ class SKAgentManager:
         self._exit_stack = AsyncExitStack()
 
         # Shared resource pools
+        self._http_client: httpx.AsyncClient | None = None  # see _get_http_client
         self._openai_clients: dict[str, AsyncOpenAI] = {}  # model_id -> client
         self._services: dict[str, OpenAIChatCompletion] = {}  # model_id -> service
         self._mcp_plugins: dict[str, Any] = {}  # mcp_id -> connected plugin
@@ -428,6 +441,43 @@ class SKAgentManager:
             len(self._openai_clients),
         )
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """HTTP connection pool shared by every OpenAI client of this manager.
+
+        Models and embeddings served from the same host then reuse
+        keep-alive connections instead of each client paying its own TLS
+        handshakes.
+        """
+        if self._http_client is None:
+            self._http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+            self._exit_stack.push_async_callback(self._http_client.aclose)
+        return self._http_client
+
+    def build_response_cache(self) -> ResponseCache:
+        """Create the conversation response cache.
+
+        Matches are exact-prompt only. With an embeddings endpoint configured,
+        conversations that set cache_threshold also match paraphrased prompts.
+        The embeddings client shares this manager's HTTP pool, closed on stop().
+        """
+        emb = self.config.embeddings
+        if not emb.is_configured:
+            return ResponseCache()
+
+        client = AsyncOpenAI(
+            api_key=emb.resolve_api_key(),
+            base_url=emb.base_url,
+            http_client=self._get_http_client(),
+        )
+
+        async def embed(text: str) -> list[float]:
+            response = await client.embeddings.create(model=emb.model_id, input=text)
+            return response.data[0].embedding
+
+        return ResponseCache(embed=embed)
+
     async def _init_model_pool(self):
         """Create OpenAI clients and services for each enabled model.
 
@@ -439,7 +489,11 @@ class SKAgentManager:
 
             try:
                 api_key = model_cfg.resolve_api_key()
-                client = AsyncOpenAI(api_key=api_key, base_url=model_cfg.base_url)
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=model_cfg.base_url,
+                    http_client=self._get_http_client(),
+                )
                 self._openai_clients[model_cfg.id] = client
 
                 service = OpenAIChatCompletion(
@@ -526,10 +580,11 @@ class SKAgentManager:
             is_self = "sk_agent.py" in mcp_args or "sk_agent" in mcp_cfg.id.lower()
 
             if is_self:
-                env["SK_AGENT_DEPTH"] = str(SK_AGENT_DEPTH + 1)
+                child_depth = get_sk_agent_depth() + 1
+                env["SK_AGENT_DEPTH"] = str(child_depth)
                 log.info(
                     "Self-inclusion: spawning child sk-agent with depth=%d",
-                    SK_AGENT_DEPTH + 1,
+                    child_depth,
                 )
 
             plugin = MCPStdioPlugin(
@@ -664,13 +719,7 @@ class SKAgentManager:
         if agent_id in self._sk_agents:
             return self._sk_agents[agent_id]
 
-        # Find agent config
-        agent_cfg = None
-        for cfg in self.config.agents:
-            if cfg.id == agent_id:
-                agent_cfg = cfg
-                break
-
+        agent_cfg = self.config.get_agent(agent_id)
         if not agent_cfg:
             log.warning("Agent '%s' not found in config", agent_id)
             return None
@@ -728,6 +777,7 @@ class SKAgentManager:
             emb_client = AsyncOpenAI(
                 api_key=emb.resolve_api_key(),
                 base_url=emb.base_url,
+                http_client=self._get_http_client(),
             )
             embeddings_gen = OpenAITextEmbedding(
                 ai_model_id=emb.model_id,
@@ -1531,6 +1581,7 @@ class SKAgentManager:
     async def stop(self):
         """Clean up all resources."""
         await self._exit_stack.aclose()
+        self._http_client = None
         self._mcp_plugins.clear()
         self._mcp_plugin_list.clear()
         self._threads.clear()
@@ -1598,7 +1649,10 @@ async def _get_manager() -> SKAgentManager:
             await _manager.start()
             # Create conversation runner with the manager's agents and lazy factory
             _conversation_runner = ConversationRunner(
-                _config, _manager._sk_agents, _manager._get_or_create_agent
+                _config,
+                _manager._sk_agents,
+                _manager._get_or_create_agent,
+                response_cache=_manager.build_response_cache(),
             )
             # Update tool descriptions dynamically
             _update_tool_descriptions(_config)
@@ -2059,23 +2113,56 @@ async def install_libreoffice(force: bool = False, custom_path: str = "") -> str
 # ---------------------------------------------------------------------------
 
 
+# Characters of each step's text sent to the client as it completes
+_STEP_PREVIEW_CHARS = 500
+
+
+def _step_reporter(ctx: Context) -> Callable[[dict], Awaitable[None]]:
+    """Callback reporting each conversation step to the MCP client.
+
+    Sent as a progress notification (step count) and an info log message
+    with the agent name and the start of its text. Reporting failures (the
+    client went away) never interrupt the conversation.
+    """
+    done = 0
+
+    async def report(step: dict) -> None:
+        nonlocal done
+        done += 1
+        text = step.get("error") or step.get("response") or step.get("content") or ""
+        try:
+            await ctx.report_progress(done)
+            await ctx.info(f"[{step.get('agent', '?')}] {text[:_STEP_PREVIEW_CHARS]}")
+        except Exception as e:
+            log.debug("Could not report conversation step: %s", e)
+
+    return report
+
+
 @mcp_server.tool()
 async def run_conversation(
     prompt: str,
     conversation: str = "",
     options: str = "",
     conversation_id: str = "",
+    ctx: Context | None = None,
 ) -> str:
     """Run a multi-agent conversation.
 
     Available conversations are listed dynamically.
-    Use list_conversations() for details.
+    Use list_conversations() for details. Each step is reported to the
+    client as it completes (progress and log notifications).
 
     Args:
         prompt: The research question or topic to deliberate.
         conversation: Conversation preset ID (default: deep-search).
-        options: JSON string with overrides (max_rounds).
+        options: JSON string with overrides (max_rounds, cache: false to bypass
+            the response cache, cache_threshold to also match paraphrased
+            prompts at that embedding similarity,
+            prefix_warm: false to skip the concurrent prefix warm-up,
+            mode: "first_valid" or "quorum" to stop concurrent runs early).
         conversation_id: Reserved for future thread continuity.
+        ctx: MCP request context, injected by FastMCP.
 
     Returns:
         JSON string with: response, conversation_type, agents_used, rounds, steps.
@@ -2088,12 +2175,17 @@ async def run_conversation(
             opts = json.loads(options)
         except json.JSONDecodeError:
             return json.dumps({"error": "Invalid options JSON"}, ensure_ascii=False)
+    if ctx is not None:
+        report = _step_reporter(ctx)
+        opts["on_step"] = opts["on_result"] = report
 
     result = await runner.run(
         prompt=prompt,
         conversation_id=conversation if conversation else None,
         options=opts,
     )
+    if HAS_ORJSON:
+        return orjson.dumps(result).decode()
     return json.dumps(result, ensure_ascii=False)
 
 
@@ -2201,7 +2293,7 @@ def main():
             _http_port,
             auth_label,
             CONFIG_PATH,
-            SK_AGENT_DEPTH,
+            get_sk_agent_depth(),
         )
 
         if _http_api_key:
@@ -2236,7 +2328,7 @@ def main():
         log.info(
             "Starting sk-agent MCP server v2.0 [stdio] (config: %s, depth=%d)",
             CONFIG_PATH,
-            SK_AGENT_DEPTH,
+            get_sk_agent_depth(),
         )
         mcp_server.run(transport="stdio")
 
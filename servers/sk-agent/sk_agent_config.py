@@ -15,9 +15,19 @@ from __future__ import annotations
 import json
 import logging
 import os
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Literal, get_args
+
+# Optional: faster JSON parsing/serialization
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 log = logging.getLogger("sk-agent.config")
 
@@ -30,7 +40,13 @@ CONFIG_PATH = os.environ.get(
     str(Path(__file__).parent / "sk_agent_config.json"),
 )
 
-SK_AGENT_DEPTH = int(os.environ.get("SK_AGENT_DEPTH", "0"))
+
+def get_sk_agent_depth() -> int:
+    """Nesting depth of this sk-agent process, read from SK_AGENT_DEPTH."""
+    return int(os.environ.get("SK_AGENT_DEPTH", "0"))
+
+
+SK_AGENT_DEPTH = get_sk_agent_depth()
 DEFAULT_MAX_RECURSION_DEPTH = 2
 
 
@@ -57,19 +73,12 @@ class ModelConfig:
 
     @classmethod
     def from_dict(cls, data: dict) -> ModelConfig:
-        return cls(
-            id=data.get("id", "unknown"),
-            base_url=data.get("base_url", "https://api.medium.text-generation-webui.myia.io/v1"),
-            api_key=data.get("api_key", "no-key"),
-            api_key_env=data.get("api_key_env", ""),
-            model_id=data.get("model_id", data.get("id", "default")),
-            vision=data.get("vision", False),
-            thinking=data.get("thinking", False),
-            enabled=data.get("enabled", True),
-            description=data.get("description", ""),
-            context_window=data.get("context_window", _infer_context_window(data)),
-            system_prompt=data.get("system_prompt", ""),
-        )
+        kwargs = _known_fields(cls, data)
+        kwargs.setdefault("id", "unknown")
+        kwargs.setdefault("model_id", data.get("id", "default"))
+        if "context_window" not in kwargs:
+            kwargs["context_window"] = _infer_context_window(data)
+        return cls(**kwargs)
 
     def to_dict(self) -> dict:
         d = {
@@ -108,12 +117,15 @@ class McpConfig:
 
     @classmethod
     def from_dict(cls, data: dict) -> McpConfig:
+        get = data.get
         return cls(
-            id=data.get("id") or data.get("name", "unknown"),
-            description=data.get("description", ""),
-            command=data.get("command", ""),
-            args=data.get("args", []),
-            env=data.get("env", {}),
+            id=get("id") or get("name", "unknown"),
+            description=get("description", ""),
+            command=get("command", ""),
+            # `or []` only allocates on a miss; a `get(key, [])` default is
+            # built on every call even when the key is present.
+            args=get("args") or [],
+            env=get("env") or {},
         )
 
     def to_dict(self) -> dict:
@@ -139,10 +151,7 @@ class MemoryConfig:
     def from_dict(cls, data: dict | None) -> MemoryConfig:
         if not data:
             return cls()
-        return cls(
-            enabled=data.get("enabled", False),
-            collection=data.get("collection", ""),
-        )
+        return cls(**_known_fields(cls, data))
 
     def to_dict(self) -> dict:
         d: dict[str, Any] = {"enabled": self.enabled}
@@ -165,13 +174,7 @@ class EmbeddingsConfig:
     def from_dict(cls, data: dict | None) -> EmbeddingsConfig:
         if not data:
             return cls()
-        return cls(
-            base_url=data.get("base_url", ""),
-            api_key=data.get("api_key", ""),
-            api_key_env=data.get("api_key_env", ""),
-            model_id=data.get("model_id", ""),
-            dimensions=data.get("dimensions", 2560),
-        )
+        return cls(**_known_fields(cls, data))
 
     def to_dict(self) -> dict:
         d: dict[str, Any] = {}
@@ -218,13 +221,7 @@ class QdrantConfig:
     def from_dict(cls, data: dict | None) -> QdrantConfig:
         if not data:
             return cls()
-        return cls(
-            url=data.get("url", "http://localhost"),
-            port=data.get("port", 6333),
-            api_key=data.get("api_key", ""),
-            api_key_env=data.get("api_key_env", ""),
-            default_collection_prefix=data.get("default_collection_prefix", "sk-agent"),
-        )
+        return cls(**_known_fields(cls, data))
 
     def to_dict(self) -> dict:
         d = {
@@ -255,15 +252,7 @@ class SamplingConfig:
     def from_dict(cls, data: dict | None) -> SamplingConfig:
         if not data:
             return cls()
-        return cls(
-            temperature=data.get("temperature", 1.0),
-            top_p=data.get("top_p", 1.0),
-            top_k=data.get("top_k", -1),
-            min_p=data.get("min_p", 0.0),
-            presence_penalty=data.get("presence_penalty", 0.0),
-            repetition_penalty=data.get("repetition_penalty", 1.0),
-            max_tokens=data.get("max_tokens", 4096),
-        )
+        return cls(**_known_fields(cls, data))
 
     def to_dict(self) -> dict:
         return {
@@ -277,7 +266,7 @@ class SamplingConfig:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class AgentConfig:
     """An agent: model + system prompt + MCP subset + memory + parameters."""
 
@@ -291,14 +280,15 @@ class AgentConfig:
 
     @classmethod
     def from_dict(cls, data: dict) -> AgentConfig:
+        get = data.get
         return cls(
-            id=data.get("id", "unknown"),
-            description=data.get("description", ""),
-            model=data.get("model", ""),
-            system_prompt=data.get("system_prompt", ""),
-            mcps=data.get("mcps", []),
-            memory=MemoryConfig.from_dict(data.get("memory")),
-            parameters=data.get("parameters", {}),
+            id=get("id", "unknown"),
+            description=get("description", ""),
+            model=_intern(get("model", "")),
+            system_prompt=get("system_prompt", ""),
+            mcps=[_intern(m) for m in get("mcps") or ()],
+            memory=MemoryConfig.from_dict(get("memory")),
+            parameters=get("parameters") or {},
         )
 
     def to_dict(self) -> dict:
@@ -316,9 +306,10 @@ class AgentConfig:
 ConversationType = Literal[
     "sequential", "concurrent", "group_chat", "handoff", "magentic"
 ]
+_VALID_CONV_TYPES: frozenset[str] = frozenset(get_args(ConversationType))
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConversationConfig:
     """A multi-agent conversation preset."""
 
@@ -328,17 +319,26 @@ class ConversationConfig:
     agents: list[str] = field(default_factory=list)  # Agent IDs
     max_rounds: int = 10
     inline_agents: list[AgentConfig] = field(default_factory=list)
+    # Stop early once a message (from termination_agent, if set) starts with this
+    termination_marker: str = ""
+    termination_agent: str = ""
+    # Serve paraphrased prompts from the response cache at this similarity
+    cache_threshold: float | None = None
 
     @classmethod
     def from_dict(cls, data: dict) -> ConversationConfig:
-        inline = [AgentConfig.from_dict(a) for a in data.get("inline_agents", [])]
+        get = data.get
+        inline = [AgentConfig.from_dict(a) for a in get("inline_agents") or ()]
         return cls(
-            id=data.get("id", "unknown"),
-            description=data.get("description", ""),
-            type=data.get("type", "sequential"),
-            agents=data.get("agents", []),
-            max_rounds=data.get("max_rounds", 10),
+            id=get("id", "unknown"),
+            description=get("description", ""),
+            type=_intern(get("type", "sequential")),
+            agents=[_intern(a) for a in get("agents") or ()],
+            max_rounds=get("max_rounds", 10),
             inline_agents=inline,
+            termination_marker=get("termination_marker", ""),
+            termination_agent=get("termination_agent", ""),
+            cache_threshold=get("cache_threshold"),
         )
 
     def to_dict(self) -> dict:
@@ -351,8 +351,19 @@ class ConversationConfig:
         }
         if self.inline_agents:
             d["inline_agents"] = [a.to_dict() for a in self.inline_agents]
+        if self.termination_marker:
+            d["termination_marker"] = self.termination_marker
+        if self.termination_agent:
+            d["termination_agent"] = self.termination_agent
+        if self.cache_threshold is not None:
+            d["cache_threshold"] = self.cache_threshold
         return d
 
+    @cached_property
+    def inline_map(self) -> dict[str, AgentConfig]:
+        """Inline agents by ID (built on first use)."""
+        return {a.id: a for a in self.inline_agents}
+
 
 @dataclass
 class SKAgentConfig:
@@ -379,15 +390,26 @@ class SKAgentConfig:
     _conversation_map: dict[str, ConversationConfig] = field(
         default_factory=dict, repr=False
     )
+    _vision_agents: list[AgentConfig] = field(default_factory=list, repr=False)
+    _vision_agent_ids: set[str] = field(default_factory=set, repr=False)
+    _agent_by_model: dict[str, AgentConfig] = field(default_factory=dict, repr=False)
 
     def __post_init__(self):
         self._build_indexes()
 
     def _build_indexes(self):
-        self._model_map = {m.id: m for m in self.models}
-        self._mcp_map = {m.id: m for m in self.mcps}
-        self._agent_map = {a.id: a for a in self.agents}
-        self._conversation_map = {c.id: c for c in self.conversations}
+        self._model_map = {_intern(m.id): m for m in self.models}
+        self._mcp_map = {_intern(m.id): m for m in self.mcps}
+        self._agent_map = {_intern(a.id): a for a in self.agents}
+        self._conversation_map = {_intern(c.id): c for c in self.conversations}
+        # First agent per model (built reversed so earlier agents win)
+        self._agent_by_model = {a.model: a for a in reversed(self.agents)}
+        self._vision_agents = [
+            a
+            for a in self.agents
+            if (model := self._model_map.get(a.model)) and model.vision
+        ]
+        self._vision_agent_ids = {a.id for a in self._vision_agents}
 
     def get_model(self, model_id: str) -> ModelConfig | None:
         return self._model_map.get(model_id)
@@ -413,27 +435,16 @@ class SKAgentConfig:
         """Get the default agent for vision queries."""
         if self.default_vision_agent:
             return self.get_agent(self.default_vision_agent)
-        # Find first agent whose model supports vision
-        for agent in self.agents:
-            model = self.get_model(agent.model)
-            if model and model.vision:
-                return agent
-        return None
+        # First agent whose model supports vision
+        return self._vision_agents[0] if self._vision_agents else None
 
     def find_agent_for_model(self, model_id: str) -> AgentConfig | None:
         """Find an agent that uses a given model (backward compat)."""
-        for agent in self.agents:
-            if agent.model == model_id:
-                return agent
-        return None
+        return self._agent_by_model.get(model_id)
 
     def agent_has_vision(self, agent_id: str) -> bool:
         """Check if an agent's model supports vision."""
-        agent = self.get_agent(agent_id)
-        if not agent:
-            return False
-        model = self.get_model(agent.model)
-        return bool(model and model.vision)
+        return agent_id in self._vision_agent_ids
 
     def to_dict(self) -> dict:
         d: dict[str, Any] = {
@@ -461,6 +472,29 @@ class SKAgentConfig:
 # ---------------------------------------------------------------------------
 
 
+def _intern(value: Any) -> Any:
+    """Intern IDs and enum-like strings that repeat across a config."""
+    return sys.intern(value) if type(value) is str else value
+
+
+# Public init-field names per dataclass, filled lazily by _known_fields()
+_FIELDS_CACHE: dict[type, frozenset[str]] = {}
+
+
+def _known_fields(cls: type, data: dict) -> dict[str, Any]:
+    """Return the entries of ``data`` matching public fields of ``cls``.
+
+    Keys missing from ``data`` are left out so the dataclass defaults apply,
+    which keeps the default values in one place (the class body).
+    """
+    known = _FIELDS_CACHE.get(cls)
+    if known is None:
+        known = _FIELDS_CACHE[cls] = frozenset(
+            f.name for f in fields(cls) if f.init and not f.name.startswith("_")
+        )
+    return {k: data[k] for k in known & data.keys()}
+
+
 def _infer_context_window(model_data: dict) -> int:
     """Infer context window from model metadata when not explicitly set."""
     if model_data.get("vision", False):
@@ -551,12 +585,10 @@ def migrate_config_v1_to_v2(raw: dict) -> dict:
     if not default_ask and models:
         default_ask = models[0].get("id", "")
     if not default_vision and models:
-        for m in models:
-            if m.get("vision", False):
-                default_vision = m.get("id", "")
-                break
-        else:
-            default_vision = models[0].get("id", "")
+        default_vision = next(
+            (m.get("id", "") for m in models if m.get("vision", False)),
+            models[0].get("id", ""),
+        )
 
     # Create one agent per enabled model (1:1 mapping)
     agents = []
@@ -671,8 +703,7 @@ def validate_config(raw: dict) -> list[str]:
             errors.append(f"conversations[{i}]: missing 'id'")
 
         ctype = c.get("type", "")
-        valid_types = ("sequential", "concurrent", "group_chat", "handoff", "magentic")
-        if ctype and ctype not in valid_types:
+        if ctype and ctype not in _VALID_CONV_TYPES:
             errors.append(f"conversations[{i}] '{cid}': invalid type '{ctype}'")
 
         # Build set of inline agent IDs for this conversation
@@ -709,7 +740,7 @@ def validate_config(raw: dict) -> list[str]:
 # ---------------------------------------------------------------------------
 
 
-def load_config(path: str | None = None) -> SKAgentConfig:
+def load_config(path: str | os.PathLike[str] | None = None) -> SKAgentConfig:
     """Load and parse configuration from JSON file.
 
     Handles:
@@ -724,10 +755,12 @@ def load_config(path: str | None = None) -> SKAgentConfig:
         log.warning("Config not found at %s, using defaults", config_path)
         return SKAgentConfig()
 
-    with open(config_path, encoding="utf-8") as f:
-        raw = json.load(f)
+    # Parse straight from bytes: no text decoding layer in between.
+    data = config_path.read_bytes()
+    raw = orjson.loads(data) if HAS_ORJSON else json.loads(data)
 
-    # Migrate v1 -> v2 if needed
+    # Migrate v1 -> v2 if needed. Both paths need the whole document parsed,
+    # so the version is read from the parsed dict (no streaming pre-pass).
     if raw.get("config_version", 0) < 2:
         raw = migrate_config_v1_to_v2(raw)
 
@@ -743,31 +776,43 @@ def load_config(path: str | None = None) -> SKAgentConfig:
 
 def _parse_config(raw: dict) -> SKAgentConfig:
     """Parse a validated v2 config dict into SKAgentConfig."""
-    models = [ModelConfig.from_dict(m) for m in raw.get("models", [])]
-    mcps = [McpConfig.from_dict(m) for m in raw.get("mcps", [])]
-    agents = [AgentConfig.from_dict(a) for a in raw.get("agents", [])]
+    get = raw.get
+    models = [ModelConfig.from_dict(m) for m in get("models", [])]
+    mcps = [McpConfig.from_dict(m) for m in get("mcps", [])]
+    agents = [AgentConfig.from_dict(a) for a in get("agents", [])]
     conversations = [
-        ConversationConfig.from_dict(c) for c in raw.get("conversations", [])
+        ConversationConfig.from_dict(c) for c in get("conversations", [])
     ]
 
     return SKAgentConfig(
-        config_version=raw.get("config_version", 2),
-        max_recursion_depth=raw.get("max_recursion_depth", DEFAULT_MAX_RECURSION_DEPTH),
-        default_agent=raw.get("default_agent", ""),
-        default_vision_agent=raw.get("default_vision_agent", ""),
-        system_prompt=raw.get("system_prompt", ""),
+        config_version=get("config_version", 2),
+        max_recursion_depth=get("max_recursion_depth", DEFAULT_MAX_RECURSION_DEPTH),
+        default_agent=get("default_agent", ""),
+        default_vision_agent=get("default_vision_agent", ""),
+        system_prompt=get("system_prompt", ""),
         models=models,
         mcps=mcps,
         agents=agents,
         conversations=conversations,
-        embeddings=EmbeddingsConfig.from_dict(raw.get("embeddings")),
-        qdrant=QdrantConfig.from_dict(raw.get("qdrant")),
-        sampling=SamplingConfig.from_dict(raw.get("sampling")),
+        embeddings=EmbeddingsConfig.from_dict(get("embeddings")),
+        qdrant=QdrantConfig.from_dict(get("qdrant")),
+        sampling=SamplingConfig.from_dict(get("sampling")),
     )
 
 
-def save_config(config: SKAgentConfig, path: str | None = None) -> None:
-    """Save configuration to JSON file."""
+def save_config(
+    config: SKAgentConfig, path: str | os.PathLike[str] | None = None
+) -> None:
+    """Save configuration to JSON file.
+
+    ``to_dict`` is kept as the serialization source (it omits empty optional
+    fields and the private lookup indexes); orjson, when installed, encodes
+    the result straight to UTF-8 bytes.
+    """
     config_path = Path(path or CONFIG_PATH)
+    data = config.to_dict()
+    if HAS_ORJSON:
+        config_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config.to_dict(), f, indent=2, ensure_ascii=False)
+        json.dump(data, f, indent=2, ensure_ascii=False)
@@ -12,25 +12,66 @@ Supported conversation types:
   - concurrent: All agents run in parallel on the same prompt
 
 DeepSearch and DeepThink are built-in conversation presets.
+
+Results contain JSON-native types only (str, int, bool, list, dict), so
+they serialize with json or orjson without a custom default.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import copy
+import hashlib
+import inspect
+import io
 import json
 import logging
-from typing import Any, Callable, Awaitable
+import math
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Awaitable, Mapping
+
+import httpx
+from openai import APIError
 
 from semantic_kernel import Kernel
-from semantic_kernel.agents import AgentGroupChat, ChatCompletionAgent
+from semantic_kernel.connectors.ai.prompt_execution_settings import PromptExecutionSettings
+from semantic_kernel.agents import (
+    AgentGroupChat,
+    ChatCompletionAgent,
+    ChatHistoryAgentThread,
+)
 from semantic_kernel.agents.strategies import (
     DefaultTerminationStrategy,
     SequentialSelectionStrategy,
+    TerminationStrategy,
+)
+from semantic_kernel.connectors.ai.chat_completion_client_base import (
+    ChatCompletionClientBase,
 )
 from semantic_kernel.contents import ChatMessageContent, AuthorRole
+from semantic_kernel.exceptions import KernelServiceNotFoundError
+from semantic_kernel.filters import FilterTypes
+from semantic_kernel.functions import KernelArguments
 
 from sk_agent_config import SKAgentConfig, AgentConfig, ConversationConfig
 
+# Optional: LLM-driven speaker selection for magentic conversations
+try:
+    from semantic_kernel.agents.strategies import KernelFunctionSelectionStrategy
+    from semantic_kernel.functions import KernelFunctionFromPrompt
+    from semantic_kernel.prompt_template import InputVariable, PromptTemplateConfig
+
+    HAS_KERNEL_FUNCTION_SELECTION = True
+except ImportError:
+    HAS_KERNEL_FUNCTION_SELECTION = False
+
 log = logging.getLogger("sk-agent.conversations")
 
 # Inlined from sk_agent to avoid circular import when sk_agent.py is the entry
@@ -45,6 +86,86 @@ def _sanitize_agent_name(name: str) -> str:
     return sanitized.strip("-")
 
 
+@lru_cache(maxsize=256)
+def _inline_agent_name(agent_id: str) -> str:
+    """SK agent name for an inline conversation agent."""
+    return "sk-conv-" + _sanitize_agent_name(agent_id)
+
+
+# ---------------------------------------------------------------------------
+# Magentic Selection
+# ---------------------------------------------------------------------------
+
+
+def _build_selection_function(agent_names: str) -> KernelFunctionFromPrompt:
+    """Build the manager prompt function that picks the next magentic speaker."""
+    # Build prompt with allow_dangerously_set_content for the
+    # history variable (SK >= 1.39 requires explicit opt-in).
+    prompt_text = (
+        "You are a conversation manager. Given the conversation so far, "
+        f"decide which agent should speak next. Available agents: {agent_names}.\n\n"
+        "Rules:\n"
+        "- If research/facts are needed, pick the researcher.\n"
+        "- If synthesis is needed, pick the synthesizer.\n"
+        "- If quality review is needed, pick the critic.\n"
+        "- Respond with ONLY the agent name, nothing else.\n\n"
+        "{{$history}}\n\n"
+        "Next agent:"
+    )
+    prompt_template_config = PromptTemplateConfig(
+        template=prompt_text,
+        allow_dangerously_set_content=True,
+        input_variables=[
+            InputVariable(
+                name="history",
+                allow_dangerously_set_content=True,
+            ),
+            InputVariable(
+                name="agents",
+                allow_dangerously_set_content=True,
+            ),
+        ],
+    )
+    return KernelFunctionFromPrompt(
+        function_name="select_next",
+        prompt_template_config=prompt_template_config,
+    )
+
+
+def _parse_selection_result(result) -> str:
+    """Extract the agent name string from the function result."""
+    # result is a FunctionResult whose .value is list[ChatMessageContent]
+    if hasattr(result, "value"):
+        val = result.value
+        # If it's a list of ChatMessageContent, get text from the last one
+        if isinstance(val, list):
+            for item in reversed(val):
+                if hasattr(item, "items"):
+                    for sub in item.items:
+                        if hasattr(sub, "text") and sub.text:
+                            return sub.text.strip()
+                if hasattr(item, "content") and item.content:
+                    return str(item.content).strip()
+        return str(val).strip()
+    return str(result).strip()
+
+
+class MarkerTerminationStrategy(TerminationStrategy):
+    """Ends the chat once an in-scope agent's message starts with ``marker``.
+
+    Only a leading marker counts (markdown emphasis allowed), so a rejection
+    such as "NOT APPROVED" or "this cannot be APPROVED yet" does not end it.
+    """
+
+    marker: str
+
+    async def should_agent_terminate(self, agent, history) -> bool:
+        if not history:
+            return False
+        pattern = rf"[\s*_#>]*{_re.escape(self.marker)}(?!\w)"
+        return _re.match(pattern, str(history[-1].content or "")) is not None
+
+
 # ---------------------------------------------------------------------------
 # Built-in Conversation Presets
 # ---------------------------------------------------------------------------
@@ -55,6 +176,8 @@ DEEP_SEARCH_PRESET = ConversationConfig(
     type="magentic",
     agents=["researcher", "synthesizer", "critic"],
     max_rounds=10,
+    termination_marker="APPROVED",
+    termination_agent="critic",
     inline_agents=[
         # These inline agents serve as fallbacks when no top-level agents with
         # these IDs exist in the config. When the config defines shared agents
@@ -165,12 +288,302 @@ DEEP_THINK_PRESET = ConversationConfig(
     ],
 )
 
-PRESETS: dict[str, ConversationConfig] = {
+# Read-only: presets are shared by every runner in the process
+PRESETS: Mapping[str, ConversationConfig] = MappingProxyType({
     "deep-search": DEEP_SEARCH_PRESET,
     "deep-think": DEEP_THINK_PRESET,
+})
+
+# Magentic conversations whose speaking order is known up front: when every
+# agent matches one of these roles, they take turns in this order instead of
+# asking the LLM manager before each turn.
+PRESET_ROUTES: dict[str, tuple[str, ...]] = {
+    "deep-search": ("researcher", "synthesizer", "critic"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Response Cache
+# ---------------------------------------------------------------------------
+
+
+class ResponseCache:
+    """Cache of conversation results keyed by prompt, per conversation scope.
+
+    A lookup tries an exact prompt match. Semantic matching is opt-in per
+    lookup: given a threshold and an ``embed`` coroutine, it then falls back
+    to the most similar cached prompt whose cosine similarity reaches the
+    threshold, so paraphrased questions skip the multi-agent run as well.
+    Prompts that differ only by an identifier (PR number, commit SHA) embed
+    almost identically, so leave it off for such conversations. Entries expire after ``ttl`` seconds (None
+    keeps them until evicted); oldest entries are evicted first. Prompts
+    are stored as 128-bit BLAKE2b digests, so long prompts are not retained.
+    Results are copied in and out, so callers never share a cached dict.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[list[float]]] | None = None,
+        max_entries: int = 256,
+        ttl: float | None = 3600.0,
+    ):
+        self._embed = embed
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # (scope, prompt digest) -> (normalized embedding or None, stored at, result)
+        self._entries: OrderedDict[
+            tuple[Any, bytes], tuple[list[float] | None, float, dict]
+        ] = OrderedDict()
+
+    @staticmethod
+    def _key(scope: Any, prompt: str) -> tuple[Any, bytes]:
+        digest = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        return scope, digest
+
+    async def _vector(self, prompt: str) -> list[float] | None:
+        if not self._embed:
+            return None
+        try:
+            vector = await self._embed(prompt)
+        except Exception as e:
+            log.warning("Response cache: embedding failed, exact match only: %s", e)
+            return None
+        norm = math.sqrt(sum(x * x for x in vector))
+        return [x / norm for x in vector] if norm else None
+
+    def _drop_expired(self) -> None:
+        if self.ttl is None:
+            return
+        cutoff = time.monotonic() - self.ttl
+        expired = [key for key, entry in self._entries.items() if entry[1] < cutoff]
+        for key in expired:
+            del self._entries[key]
+
+    async def lookup(
+        self, scope: Any, prompt: str, threshold: float | None = None
+    ) -> tuple[dict | None, list[float] | None]:
+        """Return ``(cached result or None, prompt embedding or None)``.
+
+        Without a ``threshold`` only exact matches are served. Otherwise the
+        embedding is computed on an exact-match miss; pass it back to
+        :meth:`put` so the entry can be matched semantically later.
+        """
+        self._drop_expired()
+        key = self._key(scope, prompt)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[2]), None
+        if threshold is None:
+            return None, None
+
+        vector = await self._vector(prompt)
+        if vector is None:
+            return None, None
+
+        best_key, best_score = None, threshold
+        for key, (cached_vector, _, _) in self._entries.items():
+            if key[0] != scope or cached_vector is None:
+                continue
+            score = sum(a * b for a, b in zip(vector, cached_vector))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None, vector
+        log.info("Response cache: semantic hit (similarity=%.3f)", best_score)
+        self._entries.move_to_end(best_key)
+        return copy.deepcopy(self._entries[best_key][2]), vector
+
+    async def get(
+        self, scope: Any, prompt: str, threshold: float | None = None
+    ) -> dict | None:
+        """Return a copy of the cached result for ``prompt`` within ``scope``."""
+        result, _ = await self.lookup(scope, prompt, threshold)
+        return result
+
+    async def put(
+        self,
+        scope: Any,
+        prompt: str,
+        result: dict,
+        vector: list[float] | None = None,
+    ) -> None:
+        """Store a copy of ``result`` for ``prompt`` within ``scope``.
+
+        ``vector`` is the embedding returned by :meth:`lookup`; entries
+        stored without one only serve exact matches.
+        """
+        key = self._key(scope, prompt)
+        self._entries[key] = (vector, time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RequestScopedToolCache:
+    """Function invocation filter sharing tool results within one request.
+
+    Concurrent agents answering the same prompt often issue the same tool
+    call (same search query, same file read). The first call runs the tool;
+    identical calls made while it is in flight or afterwards await its result.
+    Kernels are shared between requests, so instances are not registered on
+    them directly: a request activates its instance with use_tool_cache(),
+    and the filter installed by install_tool_cache_filter() dispatches to it.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._results: dict[tuple[str, str], asyncio.Future] = {}
+
+    @staticmethod
+    def _key(context) -> tuple[str, str]:
+        args = json.dumps(dict(context.arguments), sort_keys=True, default=str)
+        return context.function.fully_qualified_name, args
+
+    async def __call__(self, context, next) -> None:
+        if context.is_streaming:
+            await next(context)
+            return
+
+        key = self._key(context)
+        async with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = asyncio.get_running_loop().create_future()
+
+        if not owner:
+            log.debug("Tool cache hit: %s", key[0])
+            context.result = await asyncio.shield(future)
+            return
+
+        try:
+            await next(context)
+        except BaseException as e:
+            # Let later callers retry rather than replaying the failure.
+            async with self._lock:
+                self._results.pop(key, None)
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # waiters re-raise it; don't log as unretrieved
+            else:
+                future.cancel()
+            raise
+        future.set_result(context.result)
+
+
+# Tool cache of the request the current task works for, if any
+_active_tool_cache: contextvars.ContextVar[RequestScopedToolCache | None] = (
+    contextvars.ContextVar("sk_agent_tool_cache", default=None)
+)
+
+
+def use_tool_cache(cache: RequestScopedToolCache | None) -> None:
+    """Route tool calls made from the current task (and its children) to ``cache``.
+
+    Call it inside the task doing the work: each asyncio task runs in a copy
+    of its parent's context, so the setting never leaks into other requests.
+    """
+    _active_tool_cache.set(cache)
+
+
+async def _tool_cache_filter(context, next) -> None:
+    cache = _active_tool_cache.get()
+    if cache is None:
+        await next(context)
+    else:
+        await cache(context, next)
+
+
+def install_tool_cache_filter(kernel: Kernel) -> None:
+    """Register the tool cache dispatch filter on ``kernel``, once."""
+    if all(f is not _tool_cache_filter for _, f in kernel.function_invocation_filters):
+        kernel.add_filter(FilterTypes.FUNCTION_INVOCATION, _tool_cache_filter)
+
+
+# Shorter shared instruction prefixes are not worth a warm-up call
+_MIN_SHARED_PREFIX_CHARS = 512
+
+
+def _chat_service_key(kernel: Kernel) -> int:
+    """Identity of the chat service behind ``kernel`` (the kernel's if none)."""
+    try:
+        return id(kernel.get_service(type=ChatCompletionClientBase))
+    except KernelServiceNotFoundError:
+        return id(kernel)
+
+
+# ---------------------------------------------------------------------------
+# Transient Failures
+# ---------------------------------------------------------------------------
+
+_DEFAULT_MAX_INFLIGHT = 8
+_MAX_RETRIES = 2
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+_TRANSIENT_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: BaseException | None) -> bool:
+    """Whether ``exc`` (or an exception it wraps) is worth retrying.
+
+    SK wraps provider errors in its own exceptions, so the cause chain is
+    searched for timeouts, connection errors and retryable HTTP statuses.
+    Errors raised by the OpenAI client are not: the SDK already retried
+    them (``max_retries``, honouring Retry-After), and retrying again per
+    agent would multiply requests during a rate-limit storm.
+    """
+    while exc is not None:
+        if isinstance(exc, APIError):
+            return False
+        if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+            return True
+        status = getattr(exc, "status_code", None)
+        if status is None:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+        if status in _TRANSIENT_STATUS:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (0-based) attempt."""
+    delay = min(_RETRY_BASE_DELAY * 2**attempt, _RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# How many valid steps a concurrent conversation waits for, given N agents
+_CONCURRENT_MODES: dict[str, Callable[[int], int]] = {
+    "all": lambda n: n,
+    "first_valid": lambda n: 1,
+    "quorum": lambda n: n // 2 + 1,
 }
 
 
+def _is_cacheable(result: dict) -> bool:
+    """A result worth replaying: a response, and steps that all succeeded.
+
+    A concurrent run where some agents hit rate limits or timeouts is
+    degraded; replaying it would hide the missing answers for the whole TTL.
+    """
+    steps = result.get("steps") or []
+    return (
+        bool(result.get("response"))
+        and bool(steps)
+        and all("error" not in step for step in steps)
+    )
+
+
+def _is_valid_step(step: dict) -> bool:
+    return bool(step.get("response")) and "error" not in step
+
+
+# Steps kept in a group-chat result are capped; the final response is not
+_MAX_STEP_CHARS = 64_000
+
+
 # ---------------------------------------------------------------------------
 # Conversation Runner
 # ---------------------------------------------------------------------------
@@ -184,33 +597,42 @@ class ConversationRunner:
         config: SKAgentConfig,
         sk_agents: dict[str, ChatCompletionAgent],
         agent_factory: Callable[[str], Awaitable[ChatCompletionAgent | None]] | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """
         Args:
             config: The full agent config (for model/agent lookups).
             sk_agents: Map of agent_id -> initialized ChatCompletionAgent from SKAgentManager.
             agent_factory: Async callable to lazily create agents by ID (e.g. manager._get_or_create_agent).
+            response_cache: Optional cache consulted before running a conversation.
         """
         self.config = config
         self.sk_agents = sk_agents
         self._agent_factory = agent_factory
+        self._response_cache = response_cache
+        # (conversation id, agent names) -> compiled magentic selection function
+        self._selection_functions: dict[tuple[str, tuple[str, ...]], Any] = {}
+        # Config is fixed for the runner's lifetime
+        self._conversations = _merged_conversations(config)
+        self._conversation_list = tuple(self._build_conversation_list())
+        # model id -> kernel of the first agent using it (see _kernel_for_model)
+        self._kernel_by_model: dict[str, Kernel] = {}
+        self._first_kernel: Kernel | None = None
+        self._indexed_agent_count = -1
+        # (agent id, model id, system prompt) -> inline agent
+        self._inline_agents: dict[tuple[str, str, str], ChatCompletionAgent] = {}
 
     def list_conversations(self) -> list[dict]:
         """List available conversation presets."""
-        result = []
-
-        # Config-defined conversations
-        for conv in self.config.conversations:
-            result.append(self._describe_conversation(conv))
+        return list(self._conversation_list)
 
-        # Built-in presets (if not overridden by config)
-        config_ids = {c.id for c in self.config.conversations}
-        for preset_id, preset in PRESETS.items():
-            if preset_id not in config_ids:
-                info = self._describe_conversation(preset)
+    def _build_conversation_list(self) -> list[dict]:
+        result = []
+        for conv_id, conv in self._conversations.items():
+            info = self._describe_conversation(conv)
+            if conv is PRESETS.get(conv_id):
                 info["builtin"] = True
-                result.append(info)
-
+            result.append(info)
         return result
 
     def _describe_conversation(self, conv: ConversationConfig) -> dict:
@@ -218,7 +640,7 @@ class ConversationRunner:
             "id": conv.id,
             "description": conv.description,
             "type": conv.type,
-            "agents": conv.agents,
+            "agents": list(conv.agents),
             "max_rounds": conv.max_rounds,
         }
 
@@ -233,23 +655,49 @@ class ConversationRunner:
         Args:
             prompt: The task/question for the agents.
             conversation_id: ID of the conversation preset to run.
-            options: Override options (max_rounds, etc.).
+            options: Override options (max_rounds, cache, cache_threshold
+                overriding the conversation's own;
+                max_inflight, max_retries, prefix_warm, mode and
+                on_result for concurrent conversations; on_step, max_step_chars and
+                keep_last_n for group chats).
 
         Returns:
-            Dict with response, agents_used, conversation_type, steps.
+            Dict with response, agents_used, conversation_type, steps
+            (plus cache_hit when a response cache is configured). On a cache
+            hit the stored result is returned as is: on_step and on_result
+            are not called.
         """
         options = options or {}
 
         # Resolve conversation config
         conv_config = self._resolve_conversation(conversation_id)
         if not conv_config:
-            available = [c.id for c in self.config.conversations] + list(PRESETS.keys())
+            available = list(self._conversations)
             return {
                 "error": f"Conversation '{conversation_id}' not found. Available: {available}"
             }
 
         max_rounds = options.get("max_rounds", conv_config.max_rounds)
 
+        # Serve repeated (or, when opted in, paraphrased) prompts from cache
+        cache = self._response_cache if options.get("cache", True) else None
+        cache_scope = (
+            conv_config.id,
+            max_rounds,
+            options.get("mode", "all"),
+            options.get("keep_last_n"),
+            options.get("max_step_chars", _MAX_STEP_CHARS),
+        )
+        prompt_vector = None
+        if cache:
+            cached, prompt_vector = await cache.lookup(
+                cache_scope,
+                prompt,
+                options.get("cache_threshold", conv_config.cache_threshold),
+            )
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+
         # Resolve agents for this conversation (async: may trigger lazy creation)
         agents = await self._resolve_conversation_agents(conv_config)
         if not agents:
@@ -258,28 +706,35 @@ class ConversationRunner:
         # Build and run the group chat
         try:
             if conv_config.type == "concurrent":
-                return await self._run_concurrent(prompt, agents, conv_config)
+                result = await self._run_concurrent(
+                    prompt, agents, conv_config, options
+                )
             else:
-                return await self._run_group_chat(
-                    prompt, agents, conv_config, max_rounds
+                result = await self._run_group_chat(
+                    prompt, agents, conv_config, max_rounds, options
                 )
         except Exception as e:
-            log.exception("Conversation '%s' failed", conv_config.id)
+            # Tracebacks only at DEBUG: failures can come in bursts (rate limits)
+            log.error(
+                "Conversation '%s' failed: %s",
+                conv_config.id,
+                e,
+                exc_info=log.isEnabledFor(logging.DEBUG),
+            )
             return {"error": str(e)}
 
+        if cache:
+            # Never cache failures (rate limits, timeouts): they would be replayed
+            if _is_cacheable(result):
+                await cache.put(cache_scope, prompt, result, prompt_vector)
+            result = {**result, "cache_hit": False}
+        return result
+
     def _resolve_conversation(
         self, conversation_id: str | None
     ) -> ConversationConfig | None:
         """Find conversation config by ID."""
-        cid = conversation_id or "deep-search"
-
-        # Check config-defined conversations first
-        for conv in self.config.conversations:
-            if conv.id == cid:
-                return conv
-
-        # Check built-in presets
-        return PRESETS.get(cid)
+        return self._conversations.get(conversation_id or "deep-search")
 
     async def _resolve_conversation_agents(
         self,
@@ -306,17 +761,23 @@ class ConversationRunner:
                 )
                 await self._agent_factory(default_cfg.id)
 
+        # Fast path: every agent is already initialized
+        resolved = [self.sk_agents.get(agent_id) for agent_id in conv_config.agents]
+        if all(resolved):
+            return resolved
+
         agents = []
-        inline_map = {a.id: a for a in conv_config.inline_agents}
+        inline_map = conv_config.inline_map
 
-        for agent_id in conv_config.agents:
+        for agent_id, existing in zip(conv_config.agents, resolved):
             # 1. Check if agent exists as initialized SK agent
-            if agent_id in self.sk_agents:
-                agents.append(self.sk_agents[agent_id])
+            if existing is not None:
+                agents.append(existing)
                 continue
 
-            # 2. Try lazy creation via factory (fixes #801: agents are lazy-initialized)
-            if self._agent_factory:
+            # 2. Try lazy creation via factory (fixes #801: agents are lazy-initialized).
+            # Inline-only IDs have no top-level config, so the factory can't build them.
+            if self._agent_factory and self.config.get_agent(agent_id):
                 agent = await self._agent_factory(agent_id)
                 if agent:
                     agents.append(agent)
@@ -351,31 +812,99 @@ class ConversationRunner:
             log.warning("No model available for inline agent '%s'", agent_cfg.id)
             return None
 
-        # Try to reuse kernel from an existing agent with the same model
-        for existing_id, existing_agent in self.sk_agents.items():
-            existing_cfg = self.config.get_agent(existing_id)
-            if existing_cfg and existing_cfg.model == model_id:
-                # Create new agent with same kernel but different instructions
-                kernel = existing_agent.kernel
-                safe_name = _sanitize_agent_name(agent_cfg.id)
-                return ChatCompletionAgent(
-                    kernel=kernel,
-                    name=f"sk-conv-{safe_name}",
-                    instructions=agent_cfg.system_prompt
-                    or "You are a helpful assistant.",
-                )
+        # Reuse the kernel of an existing agent with the same model,
+        # else the first available agent's kernel
+        kernel = self._kernel_for_model(model_id)
+        if kernel is None:
+            return None
 
-        # Fallback: use the first available agent's kernel
-        if self.sk_agents:
-            first_agent = next(iter(self.sk_agents.values()))
-            safe_name = _sanitize_agent_name(agent_cfg.id)
-            return ChatCompletionAgent(
-                kernel=first_agent.kernel,
-                name=f"sk-conv-{safe_name}",
+        # Agents hold no conversation state (that lives in the thread),
+        # so one instance per definition and kernel is reused across runs.
+        key = (agent_cfg.id, model_id, agent_cfg.system_prompt)
+        agent = self._inline_agents.get(key)
+        if agent is None or agent.kernel is not kernel:
+            agent = ChatCompletionAgent(
+                kernel=kernel,
+                name=_inline_agent_name(agent_cfg.id),
                 instructions=agent_cfg.system_prompt or "You are a helpful assistant.",
             )
+            self._inline_agents[key] = agent
+        return agent
+
+    def _kernel_for_model(self, model_id: str) -> Kernel | None:
+        """Return a kernel serving ``model_id``, or the first agent's kernel.
+
+        ``sk_agents`` is shared with the manager and grows as agents are
+        created lazily, so the index is rebuilt when its size changes.
+        """
+        if len(self.sk_agents) != self._indexed_agent_count:
+            kernel_by_model: dict[str, Kernel] = {}
+            for agent_id, agent in self.sk_agents.items():
+                agent_cfg = self.config.get_agent(agent_id)
+                if agent_cfg and agent_cfg.model:
+                    kernel_by_model.setdefault(agent_cfg.model, agent.kernel)
+            self._kernel_by_model = kernel_by_model
+            self._first_kernel = (
+                next(iter(self.sk_agents.values())).kernel if self.sk_agents else None
+            )
+            self._indexed_agent_count = len(self.sk_agents)
+        return self._kernel_by_model.get(model_id, self._first_kernel)
 
-        return None
+    def _get_selection_function(
+        self, conv_id: str, agents: list[ChatCompletionAgent]
+    ) -> KernelFunctionFromPrompt:
+        """Return the magentic selection function for this roster, built once.
+
+        Only the prompt function is shared: selection strategies keep
+        per-run state (has_selected), so a fresh one wraps it on every run.
+        """
+        agent_names = tuple(a.name for a in agents)
+        key = (conv_id, agent_names)
+        function = self._selection_functions.get(key)
+        if function is None:
+            function = _build_selection_function(", ".join(agent_names))
+            self._selection_functions[key] = function
+        return function
+
+    @staticmethod
+    def _preset_route(
+        conv_id: str, agents: list[ChatCompletionAgent]
+    ) -> list[ChatCompletionAgent] | None:
+        """Order ``agents`` by the preset route, or None if they don't fit it."""
+        roles = PRESET_ROUTES.get(conv_id)
+        if not roles or len(agents) != len(roles):
+            return None
+        by_role = {}
+        for agent in agents:
+            role = next((r for r in roles if agent.name.endswith(f"-{r}")), None)
+            if role is None or role in by_role:
+                return None
+            by_role[role] = agent
+        return [by_role[r] for r in roles]
+
+    @staticmethod
+    def _build_termination_strategy(
+        conv_config: ConversationConfig,
+        agents: list[ChatCompletionAgent],
+        max_iter: int,
+    ) -> TerminationStrategy:
+        """Stop at the conversation's marker if it has one, else after max_iter."""
+        marker = conv_config.termination_marker
+        if marker:
+            scope = agents
+            if conv_config.termination_agent:
+                suffix = f"-{_sanitize_agent_name(conv_config.termination_agent)}"
+                scope = [a for a in agents if a.name.endswith(suffix)]
+            if scope:
+                return MarkerTerminationStrategy(
+                    marker=marker, maximum_iterations=max_iter, agents=scope
+                )
+            log.warning(
+                "Termination agent '%s' not in conversation '%s', using max rounds",
+                conv_config.termination_agent,
+                conv_config.id,
+            )
+        return DefaultTerminationStrategy(maximum_iterations=max_iter, agents=agents)
 
     async def _run_group_chat(
         self,
@@ -383,89 +912,89 @@ class ConversationRunner:
         agents: list[ChatCompletionAgent],
         conv_config: ConversationConfig,
         max_rounds: int,
+        options: dict | None = None,
     ) -> dict[str, Any]:
-        """Run a group chat conversation (sequential, group_chat, or magentic)."""
+        """Run a group chat conversation (sequential, group_chat, or magentic).
+
+        ``options["on_step"]`` (sync or async callable) receives each full
+        step as it is produced. Stored steps are cut to ``max_step_chars``
+        (flagged ``truncated``) and, with ``keep_last_n``, only the most
+        recent ones are kept; the final response is always complete.
+        """
+        options = options or {}
+        on_step = options.get("on_step")
+        max_chars = options.get("max_step_chars", _MAX_STEP_CHARS)
+        keep_last_n = options.get("keep_last_n")
+
+        steps: deque[dict] = deque(maxlen=keep_last_n or None)
+        rounds = 0
+        response = ""
+        async for step in self._iter_group_chat(
+            prompt, agents, conv_config, max_rounds
+        ):
+            rounds += 1
+            response = step["content"]
+            if on_step:
+                pending = on_step(step)
+                if inspect.isawaitable(pending):
+                    await pending
+            if max_chars and len(response) > max_chars:
+                step = {**step, "content": response[:max_chars], "truncated": True}
+            steps.append(step)
+
+        return {
+            "response": response,
+            "conversation_type": conv_config.type,
+            "conversation_id": conv_config.id,
+            "agents_used": [a.name for a in agents],
+            "rounds": rounds,
+            "steps": list(steps),
+        }
+
+    async def _iter_group_chat(
+        self,
+        prompt: str,
+        agents: list[ChatCompletionAgent],
+        conv_config: ConversationConfig,
+        max_rounds: int,
+    ) -> AsyncIterator[dict]:
+        """Run a group chat, yielding each message step as it is produced."""
+        if not agents:
+            raise ValueError(f"No agents available for conversation '{conv_config.id}'")
+
         # Build selection strategy
-        if conv_config.type == "magentic":
+        route = (
+            self._preset_route(conv_config.id, agents)
+            if conv_config.type == "magentic"
+            else None
+        )
+        if route:
+            # Known pipeline: deterministic turns, no manager LLM call per turn
+            agents = route
+            selection_strategy = SequentialSelectionStrategy()
+        elif conv_config.type == "magentic" and HAS_KERNEL_FUNCTION_SELECTION:
             # For magentic: use KernelFunction-based selection if possible
             # Fall back to sequential if no LLM selection available
             try:
-                from semantic_kernel.agents.strategies import (
-                    KernelFunctionSelectionStrategy,
-                )
-                from semantic_kernel.functions import KernelFunctionFromPrompt
-                from semantic_kernel.prompt_template import (
-                    InputVariable,
-                    PromptTemplateConfig,
-                )
-
-                # Use the first agent's kernel for the manager
-                manager_kernel = agents[0].kernel if agents else Kernel()
-                agent_names = ", ".join(a.name for a in agents)
-
-                # Build prompt with allow_dangerously_set_content for the
-                # history variable (SK >= 1.39 requires explicit opt-in).
-                prompt_text = (
-                    "You are a conversation manager. Given the conversation so far, "
-                    f"decide which agent should speak next. Available agents: {agent_names}.\n\n"
-                    "Rules:\n"
-                    "- If research/facts are needed, pick the researcher.\n"
-                    "- If synthesis is needed, pick the synthesizer.\n"
-                    "- If quality review is needed, pick the critic.\n"
-                    "- Respond with ONLY the agent name, nothing else.\n\n"
-                    "{{$history}}\n\n"
-                    "Next agent:"
-                )
-                prompt_template_config = PromptTemplateConfig(
-                    template=prompt_text,
-                    allow_dangerously_set_content=True,
-                    input_variables=[
-                        InputVariable(
-                            name="history",
-                            allow_dangerously_set_content=True,
-                        ),
-                        InputVariable(
-                            name="agents",
-                            allow_dangerously_set_content=True,
-                        ),
-                    ],
-                )
-                selection_fn = KernelFunctionFromPrompt(
-                    function_name="select_next",
-                    prompt_template_config=prompt_template_config,
-                )
-
-                def _parse_selection_result(result) -> str:
-                    """Extract the agent name string from the function result."""
-                    # result is a FunctionResult whose .value is list[ChatMessageContent]
-                    if hasattr(result, "value"):
-                        val = result.value
-                        # If it's a list of ChatMessageContent, get text from the last one
-                        if isinstance(val, list):
-                            for item in reversed(val):
-                                if hasattr(item, "items"):
-                                    for sub in item.items:
-                                        if hasattr(sub, "text") and sub.text:
-                                            return sub.text.strip()
-                                if hasattr(item, "content") and item.content:
-                                    return str(item.content).strip()
-                        return str(val).strip()
-                    return str(result).strip()
-
                 selection_strategy = KernelFunctionSelectionStrategy(
-                    kernel=manager_kernel,
-                    function=selection_fn,
+                    # Use the first agent's kernel for the manager
+                    kernel=agents[0].kernel,
+                    function=self._get_selection_function(conv_config.id, agents),
                     agent_variable_name="agents",
                     history_variable_name="history",
                     result_parser=_parse_selection_result,
                 )
-            except (ImportError, Exception) as e:
+            except Exception as e:
                 log.warning(
                     "KernelFunctionSelectionStrategy not available, falling back to sequential: %s",
                     e,
                 )
                 selection_strategy = SequentialSelectionStrategy()
         else:
+            if conv_config.type == "magentic":
+                log.warning(
+                    "KernelFunctionSelectionStrategy not available, falling back to sequential"
+                )
             # sequential and group_chat both use round-robin
             selection_strategy = SequentialSelectionStrategy()
 
@@ -476,9 +1005,8 @@ class ConversationRunner:
         else:
             max_iter = max_rounds
 
-        termination_strategy = DefaultTerminationStrategy(
-            maximum_iterations=max_iter,
-            agents=agents,
+        termination_strategy = self._build_termination_strategy(
+            conv_config, agents, max_iter
         )
 
         # Create group chat
@@ -493,62 +1021,188 @@ class ConversationRunner:
             ChatMessageContent(role=AuthorRole.USER, content=prompt)
         )
 
-        # Run and collect messages
-        steps = []
-        final_response = ""
         async for message in chat.invoke():
-            step = {
-                "agent": message.name or str(message.role),
-                "content": str(message.content) if message.content else "",
-            }
-            steps.append(step)
-            final_response = step["content"]
+            # .content scans message items on every access, so read it once
+            content = message.content
+            if content is None:
+                content = ""
+            elif not isinstance(content, str):
+                content = str(content)
+            yield {"agent": message.name or message.role.value, "content": content}
+
+    async def _warm_shared_prefix(
+        self, prompt: str, agents: list[ChatCompletionAgent]
+    ) -> None:
+        """Prime the backend prefix cache before a concurrent fan-out.
+
+        Agents are grouped by chat service: the manager creates one per
+        model, shared by the separate kernels of every agent on that model.
+        A group whose instructions are identical is warmed with the full
+        prompt; a group whose instructions only share a long common prefix
+        is warmed with that prefix as the system prompt. Each warm-up is a
+        one-token call.
+        """
+        groups: dict[int, list[ChatCompletionAgent]] = {}
+        for agent in agents:
+            groups.setdefault(_chat_service_key(agent.kernel), []).append(agent)
 
-        return {
-            "response": final_response,
-            "conversation_type": conv_config.type,
-            "conversation_id": conv_config.id,
-            "agents_used": [a.name for a in agents],
-            "rounds": len(steps),
-            "steps": steps,
-        }
+        warmers = []
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            first = group[0]
+            if all(a.instructions == first.instructions for a in group[1:]):
+                warmers.append(first)
+                continue
+            prefix = os.path.commonprefix([a.instructions or "" for a in group])
+            if len(prefix) >= _MIN_SHARED_PREFIX_CHARS:
+                warmers.append(
+                    ChatCompletionAgent(
+                        kernel=first.kernel, name=first.name, instructions=prefix
+                    )
+                )
+        if not warmers:
+            return
+
+        settings = PromptExecutionSettings(extension_data={"max_tokens": 1})
+        message = ChatMessageContent(role=AuthorRole.USER, content=prompt)
+
+        async def warm(agent: ChatCompletionAgent) -> None:
+            try:
+                async for _ in agent.invoke(
+                    messages=message,
+                    thread=ChatHistoryAgentThread(),
+                    arguments=KernelArguments(settings=settings),
+                ):
+                    pass
+            except Exception as e:
+                log.debug("Prefix warm-up failed, continuing: %s", e)
+
+        await asyncio.gather(*(warm(agent) for agent in warmers))
+
+    async def _iter_concurrent(
+        self,
+        prompt: str,
+        agents: list[ChatCompletionAgent],
+        options: dict,
+    ) -> AsyncIterator[tuple[int, dict]]:
+        """Run agents concurrently, yielding (agent index, step) as each finishes.
+
+        At most ``options["max_inflight"]`` agents run at once (default 8) so
+        a wide fan-out doesn't trip the provider's rate limits.
+        Tasks still running when the consumer stops iterating are cancelled.
+        Identical tool calls across the agents are executed only once, and
+        transient failures are retried up to ``options["max_retries"]`` times.
+        """
+        semaphore = asyncio.Semaphore(options.get("max_inflight") or _DEFAULT_MAX_INFLIGHT)
+        tool_cache = RequestScopedToolCache()
+        for agent in agents:
+            install_tool_cache_filter(agent.kernel)
+
+        max_retries = options.get("max_retries", _MAX_RETRIES)
+
+        # SK only reads input messages, so every agent shares one
+        message = ChatMessageContent(role=AuthorRole.USER, content=prompt)
+
+        async def run_single(index: int, agent: ChatCompletionAgent) -> tuple[int, dict]:
+            use_tool_cache(tool_cache)
+            for attempt in range(max_retries + 1):
+                try:
+                    async with semaphore:
+                        thread = ChatHistoryAgentThread()
+                        final = None
+                        async for response in agent.invoke(messages=message, thread=thread):
+                            final = response
+                except Exception as e:
+                    if attempt < max_retries and _is_transient(e):
+                        delay = _retry_delay(attempt)
+                        log.warning(
+                            "Agent '%s' failed (%s), retrying in %.1fs", agent.name, e, delay
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                    return index, {
+                        "agent": agent.name,
+                        "response": "",
+                        "error": str(e),
+                        "retries": attempt,
+                    }
+                return index, {
+                    "agent": agent.name,
+                    "response": str(final) if final else "",
+                }
+
+        if options.get("prefix_warm", True):
+            await self._warm_shared_prefix(prompt, agents)
+
+        tasks = [
+            asyncio.ensure_future(run_single(i, agent)) for i, agent in enumerate(agents)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def _run_concurrent(
         self,
         prompt: str,
         agents: list[ChatCompletionAgent],
         conv_config: ConversationConfig,
+        options: dict | None = None,
     ) -> dict[str, Any]:
-        """Run all agents concurrently on the same prompt."""
-        from semantic_kernel.agents import ChatHistoryAgentThread
-
-        async def run_single(agent: ChatCompletionAgent) -> dict:
-            thread = ChatHistoryAgentThread()
-            message = ChatMessageContent(role=AuthorRole.USER, content=prompt)
-            final = None
-            async for response in agent.invoke(messages=message, thread=thread):
-                final = response
-            return {
-                "agent": agent.name,
-                "response": str(final) if final else "",
-            }
-
-        results = await asyncio.gather(
-            *(run_single(agent) for agent in agents),
-            return_exceptions=True,
-        )
-
-        steps = []
-        for r in results:
-            if isinstance(r, Exception):
-                steps.append({"agent": "error", "response": str(r)})
-            else:
-                steps.append(r)
+        """Run all agents concurrently on the same prompt.
+
+        ``options["on_result"]`` (sync or async callable) receives each step
+        as soon as its agent finishes; the returned steps keep agent order.
+        ``options["mode"]`` decides when to stop: ``"all"`` (default) waits
+        for every agent, ``"first_valid"`` and ``"quorum"`` cancel the rest
+        once one or a majority of agents return a non-empty, error-free step.
+        Agents cancelled this way are left out of the steps.
+        """
+        options = options or {}
+        on_result = options.get("on_result")
+        mode = options.get("mode", "all")
+        if mode not in _CONCURRENT_MODES:
+            raise ValueError(
+                f"Unknown concurrent mode '{mode}'. Available: {list(_CONCURRENT_MODES)}"
+            )
+        needed = _CONCURRENT_MODES[mode](len(agents))
 
-        # Combine responses
-        combined = "\n\n---\n\n".join(
-            f"**{s['agent']}**: {s['response']}" for s in steps if s.get("response")
-        )
+        slots: list[dict | None] = [None] * len(agents)
+        valid = 0
+        results = self._iter_concurrent(prompt, agents, options)
+        try:
+            async for index, step in results:
+                slots[index] = step
+                if on_result:
+                    pending = on_result(step)
+                    if inspect.isawaitable(pending):
+                        await pending
+                if _is_valid_step(step):
+                    valid += 1
+                    if valid >= needed:
+                        break
+        finally:
+            # Cancels agents still running when stopping early
+            await results.aclose()
+        steps = [s for s in slots if s is not None]
+
+        # Combine responses, writing each piece straight into one buffer
+        buf = io.StringIO()
+        separator = ""
+        for s in steps:
+            response = s.get("response")
+            if not response:
+                continue
+            buf.write(separator)
+            buf.write("**")
+            buf.write(s["agent"])
+            buf.write("**: ")
+            buf.write(response)
+            separator = "\n\n---\n\n"
+        combined = buf.getvalue()
 
         return {
             "response": combined,
@@ -565,37 +1219,48 @@ class ConversationRunner:
 # ---------------------------------------------------------------------------
 
 
-def build_run_conversation_description(config: SKAgentConfig) -> str:
-    """Build dynamic description for run_conversation tool."""
-    lines = [
-        "Run a multi-agent conversation.",
-        "",
-        "Available conversations:",
-    ]
+def _merged_conversations(config: SKAgentConfig) -> dict[str, ConversationConfig]:
+    """Config conversations by ID, then the built-in presets they don't override.
 
-    # Config conversations
+    When an ID is defined twice in the config, the first definition wins.
+    """
+    merged: dict[str, ConversationConfig] = {}
     for conv in config.conversations:
-        agent_list = ", ".join(conv.agents)
-        lines.append(f"  - {conv.id}: {conv.description} ({agent_list}) [{conv.type}]")
-
-    # Built-in presets not overridden
-    config_ids = {c.id for c in config.conversations}
+        merged.setdefault(conv.id, conv)
     for preset_id, preset in PRESETS.items():
-        if preset_id not in config_ids:
-            agent_list = ", ".join(preset.agents)
-            lines.append(
-                f"  - {preset_id}: {preset.description} ({agent_list}) [{preset.type}, built-in]"
-            )
+        merged.setdefault(preset_id, preset)
+    return merged
 
-    lines.extend(
-        [
-            "",
-            "Parameters:",
-            "  prompt: The research question or topic to deliberate",
-            "  conversation: Conversation ID (default: deep-search)",
-            "  options: JSON - max_rounds override",
-            "  conversation_id: Not used (reserved for future thread continuity)",
-        ]
-    )
 
-    return "\n".join(lines)
+# Last (config, description) pair; configs are not mutated after load.
+_run_conversation_description: tuple[SKAgentConfig | None, str] = (None, "")
+
+
+def build_run_conversation_description(config: SKAgentConfig) -> str:
+    """Build dynamic description for run_conversation tool."""
+    global _run_conversation_description
+    cached_config, description = _run_conversation_description
+    if cached_config is config:
+        return description
+
+    entries = (
+        f"  - {conv_id}: {conv.description} ({', '.join(conv.agents)})"
+        f" [{conv.type}{', built-in' if conv is PRESETS.get(conv_id) else ''}]"
+        for conv_id, conv in _merged_conversations(config).items()
+    )
+    description = "\n".join(
+        chain(
+            ("Run a multi-agent conversation.", "", "Available conversations:"),
+            entries,
+            (
+                "",
+                "Parameters:",
+                "  prompt: The research question or topic to deliberate",
+                "  conversation: Conversation ID (default: deep-search)",
+                "  options: JSON - max_rounds override, cache (default true, exact match)",
+                "  conversation_id: Not used (reserved for future thread continuity)",
+            ),
+        )
+    )
+    _run_conversation_description = (config, description)
+    return description
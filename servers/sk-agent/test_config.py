@@ -10,16 +10,12 @@ Tests cover:
 - Default agent resolution
 """
 
+import copy
 import json
-import os
-import sys
-from pathlib import Path
+from typing import Iterator
 
 import pytest
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
-
 from sk_agent_config import (
     AgentConfig,
     ConfigValidationError,
@@ -32,6 +28,7 @@ from sk_agent_config import (
     SKAgentConfig,
     load_config,
     migrate_config_v1_to_v2,
+    save_config,
     validate_config,
     _infer_context_window,
     _parse_config,
@@ -43,10 +40,13 @@ from sk_agent_config import (
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def v1_config() -> dict:
-    """A typical v1 config (no config_version field)."""
-    return {
+@pytest.fixture(scope="session")
+def v1_base(check_unmutated) -> Iterator[dict]:
+    """A typical v1 config (no config_version field).
+
+    Shared: do not mutate (checked at session end).
+    """
+    config = {
         "default_ask_model": "glm-5",
         "default_vision_model": "glm-4.6v",
         "max_recursion_depth": 2,
@@ -97,12 +97,14 @@ def v1_config() -> dict:
         ],
         "system_prompt": "You are a helpful assistant.",
     }
+    with check_unmutated(config, "v1_base"):
+        yield config
 
 
-@pytest.fixture
-def v2_config() -> dict:
-    """A valid v2 config."""
-    return {
+@pytest.fixture(scope="session")
+def v2_base(check_unmutated) -> Iterator[dict]:
+    """A valid v2 config. Shared: do not mutate (checked at session end)."""
+    config = {
         "config_version": 2,
         "max_recursion_depth": 2,
         "default_agent": "analyst",
@@ -192,14 +194,42 @@ def v2_config() -> dict:
             },
         ],
     }
+    with check_unmutated(config, "v2_base"):
+        yield config
+
+
+@pytest.fixture(scope="session")
+def parsed_v2(v2_base) -> SKAgentConfig:
+    """The v2 config parsed once per session. Shared: do not mutate."""
+    return _parse_config(v2_base)
 
 
 @pytest.fixture
-def config_file(tmp_path, v1_config):
-    """Write v1 config to a temp file."""
-    path = tmp_path / "config.json"
-    path.write_text(json.dumps(v1_config), encoding="utf-8")
-    return str(path)
+def v1_config(v1_base) -> dict:
+    """A private copy of the v1 config, for tests that modify it."""
+    return copy.deepcopy(v1_base)
+
+
+@pytest.fixture
+def v2_config(v2_base) -> dict:
+    """A private copy of the v2 config, for tests that modify it."""
+    return copy.deepcopy(v2_base)
+
+
+@pytest.fixture(scope="session")
+def config_file(tmp_path_factory, v1_base):
+    """Write v1 config to a temp file, once per session. Do not modify it."""
+    path = tmp_path_factory.mktemp("config") / "config.json"
+    path.write_bytes(json.dumps(v1_base).encode())
+    return path
+
+
+@pytest.fixture(scope="session")
+def v2_file(tmp_path_factory, v2_base):
+    """Write v2 config to a temp file, once per session. Do not modify it."""
+    path = tmp_path_factory.mktemp("config") / "v2.json"
+    path.write_bytes(json.dumps(v2_base).encode())
+    return path
 
 
 # ---------------------------------------------------------------------------
@@ -210,24 +240,24 @@ def config_file(tmp_path, v1_config):
 class TestMigrateV1ToV2:
     """Test v1 -> v2 config migration."""
 
-    def test_already_v2_passthrough(self, v2_config):
+    def test_already_v2_passthrough(self, v2_base):
         """V2 config should pass through unchanged."""
-        result = migrate_config_v1_to_v2(v2_config)
+        result = migrate_config_v1_to_v2(v2_base)
         assert result["config_version"] == 2
         assert "agents" in result
-        assert result is v2_config  # Same object, not copied
+        assert result is v2_base  # Same object, not copied
 
-    def test_basic_migration(self, v1_config):
+    def test_basic_migration(self, v1_base):
         """V1 config gets config_version=2 and agents section."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         assert result["config_version"] == 2
         assert "agents" in result
         assert "models" in result
         assert "mcps" in result
 
-    def test_agent_per_enabled_model(self, v1_config):
+    def test_agent_per_enabled_model(self, v1_base):
         """One agent per enabled model, disabled models skipped."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         agents = result["agents"]
         # 2 enabled models -> 2 agents
         assert len(agents) == 2
@@ -236,34 +266,42 @@ class TestMigrateV1ToV2:
         assert "glm-5" in agent_ids
         assert "disabled-model" not in agent_ids
 
-    def test_agents_get_all_mcps(self, v1_config):
+    def test_agents_get_all_mcps(self, v1_base):
         """In v1, all MCPs are shared -> each agent gets all MCP IDs."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         for agent in result["agents"]:
             assert "searxng" in agent["mcps"]
             assert "playwright" in agent["mcps"]
 
-    def test_agents_inherit_system_prompt(self, v1_config):
+    def test_agents_inherit_system_prompt(self, v1_base):
         """Agents inherit the global system_prompt."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         for agent in result["agents"]:
             assert agent["system_prompt"] == "You are a helpful assistant."
 
-    def test_default_agent_mapped(self, v1_config):
+    def test_default_agent_mapped(self, v1_base):
         """default_ask_model -> default_agent, default_vision_model -> default_vision_agent."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         assert result["default_agent"] == "glm-5"
         assert result["default_vision_agent"] == "glm-4.6v"
 
-    def test_mcps_get_id_field(self, v1_config):
-        """MCPs with only 'name' get an 'id' field from name."""
+    def test_default_vision_falls_back_to_first_model(self, v1_config):
+        """Without a vision model, default_vision_agent is the first model."""
+        del v1_config["default_vision_model"]
+        for m in v1_config["models"]:
+            m["vision"] = False
         result = migrate_config_v1_to_v2(v1_config)
+        assert result["default_vision_agent"] == "glm-4.6v"
+
+    def test_mcps_get_id_field(self, v1_base):
+        """MCPs with only 'name' get an 'id' field from name."""
+        result = migrate_config_v1_to_v2(v1_base)
         for mcp in result["mcps"]:
             assert "id" in mcp
 
-    def test_empty_conversations(self, v1_config):
+    def test_empty_conversations(self, v1_base):
         """Migrated config has empty conversations (no auto-generation)."""
-        result = migrate_config_v1_to_v2(v1_config)
+        result = migrate_config_v1_to_v2(v1_base)
         assert result["conversations"] == []
 
     def test_legacy_single_model_format(self):
@@ -318,68 +356,78 @@ class TestMigrateV1ToV2:
 class TestValidation:
     """Test config validation."""
 
-    def test_valid_config(self, v2_config):
+    def test_valid_config(self, v2_base):
         """Valid config returns no errors."""
-        errors = validate_config(v2_config)
+        errors = validate_config(v2_base)
         assert errors == []
 
     def test_rejects_v1(self):
         """Config without version >= 2 is rejected."""
-        errors = validate_config({"config_version": 1})
-        assert any("config_version" in e for e in errors)
-
-    def test_duplicate_model_ids(self, v2_config):
-        v2_config["models"].append({"id": "glm-5", "model_id": "dup"})
-        errors = validate_config(v2_config)
-        assert any("duplicate id 'glm-5'" in e for e in errors)
-
-    def test_duplicate_agent_ids(self, v2_config):
-        v2_config["agents"].append({"id": "analyst", "model": "glm-5"})
-        errors = validate_config(v2_config)
-        assert any("duplicate id 'analyst'" in e for e in errors)
-
-    def test_agent_references_missing_model(self, v2_config):
-        v2_config["agents"].append({"id": "bad-agent", "model": "nonexistent"})
-        errors = validate_config(v2_config)
-        assert any("nonexistent" in e for e in errors)
-
-    def test_agent_references_missing_mcp(self, v2_config):
-        v2_config["agents"][0]["mcps"].append("nonexistent-mcp")
-        errors = validate_config(v2_config)
-        assert any("nonexistent-mcp" in e for e in errors)
-
-    def test_default_agent_missing(self, v2_config):
-        v2_config["default_agent"] = "nonexistent-agent"
-        errors = validate_config(v2_config)
-        assert any("nonexistent-agent" in e for e in errors)
-
-    def test_conversation_missing_agent(self, v2_config):
-        """Conversation referencing non-existent agent (not in top-level or inline)."""
-        v2_config["conversations"][0]["agents"].append("ghost")
-        errors = validate_config(v2_config)
-        assert any("ghost" in e for e in errors)
-
-    def test_conversation_inline_agent_valid(self, v2_config):
+        errors = "\n".join(validate_config({"config_version": 1}))
+        assert "config_version" in errors
+
+    @pytest.mark.parametrize(
+        "mutate,expected",
+        [
+            pytest.param(
+                lambda c: c["models"].append({"id": "glm-5", "model_id": "dup"}),
+                "duplicate id 'glm-5'",
+                id="duplicate_model_ids",
+            ),
+            pytest.param(
+                lambda c: c["agents"].append({"id": "analyst", "model": "glm-5"}),
+                "duplicate id 'analyst'",
+                id="duplicate_agent_ids",
+            ),
+            pytest.param(
+                lambda c: c["agents"].append({"id": "bad-agent", "model": "nonexistent"}),
+                "nonexistent",
+                id="agent_references_missing_model",
+            ),
+            pytest.param(
+                lambda c: c["agents"][0]["mcps"].append("nonexistent-mcp"),
+                "nonexistent-mcp",
+                id="agent_references_missing_mcp",
+            ),
+            pytest.param(
+                lambda c: c.update(default_agent="nonexistent-agent"),
+                "nonexistent-agent",
+                id="default_agent_missing",
+            ),
+            # Not a top-level agent and not an inline agent either
+            pytest.param(
+                lambda c: c["conversations"][0]["agents"].append("ghost"),
+                "ghost",
+                id="conversation_missing_agent",
+            ),
+            pytest.param(
+                lambda c: c["conversations"][0].update(type="invalid_type"),
+                "invalid_type",
+                id="invalid_conversation_type",
+            ),
+            # Memory enabled but no embeddings configured
+            pytest.param(
+                lambda c: c.pop("embeddings", None),
+                "embeddings",
+                id="memory_without_embeddings",
+            ),
+        ],
+    )
+    def test_invalid_config(self, v2_config, mutate, expected):
+        mutate(v2_config)
+        errors = "\n".join(validate_config(v2_config))
+        assert expected in errors
+
+    def test_conversation_inline_agent_valid(self, v2_base):
         """Inline agent refs should be valid."""
         # researcher and synthesizer are inline agents -> no error
-        errors = validate_config(v2_config)
-        assert not any("researcher" in e for e in errors)
-
-    def test_invalid_conversation_type(self, v2_config):
-        v2_config["conversations"][0]["type"] = "invalid_type"
-        errors = validate_config(v2_config)
-        assert any("invalid_type" in e for e in errors)
-
-    def test_memory_without_embeddings(self, v2_config):
-        """Memory enabled but no embeddings configured -> error."""
-        v2_config.pop("embeddings", None)
-        errors = validate_config(v2_config)
-        assert any("embeddings" in e for e in errors)
+        errors = "\n".join(validate_config(v2_base))
+        assert "researcher" not in errors
 
-    def test_memory_with_embeddings_ok(self, v2_config):
+    def test_memory_with_embeddings_ok(self, v2_base):
         """Memory with proper embeddings -> no error."""
-        errors = validate_config(v2_config)
-        assert not any("embeddings" in e for e in errors)
+        errors = "\n".join(validate_config(v2_base))
+        assert "embeddings" not in errors
 
 
 # ---------------------------------------------------------------------------
@@ -390,8 +438,8 @@ class TestValidation:
 class TestParsing:
     """Test parsing raw dict into SKAgentConfig and back."""
 
-    def test_parse_v2(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_parse_v2(self, parsed_v2):
+        cfg = parsed_v2
         assert type(cfg).__name__ == "SKAgentConfig"
         assert cfg.config_version == 2
         assert len(cfg.models) == 2
@@ -399,8 +447,8 @@ class TestParsing:
         assert len(cfg.agents) == 3
         assert len(cfg.conversations) == 1
 
-    def test_roundtrip(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_roundtrip(self, v2_base):
+        cfg = _parse_config(v2_base)
         exported = cfg.to_dict()
         # Re-parse
         cfg2 = _parse_config(exported)
@@ -408,54 +456,57 @@ class TestParsing:
         assert len(cfg2.models) == len(cfg.models)
         assert len(cfg2.agents) == len(cfg.agents)
 
-    def test_model_lookup(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_model_lookup(self, parsed_v2):
+        cfg = parsed_v2
         m = cfg.get_model("glm-5")
         assert m is not None
         assert m.context_window == 200000
         assert m.vision is False
 
-    def test_agent_lookup(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_agent_lookup(self, parsed_v2):
+        cfg = parsed_v2
         a = cfg.get_agent("analyst")
         assert a is not None
         assert a.model == "glm-5"
         assert a.memory.enabled is True
         assert a.memory.collection == "analyst-memory"
 
-    def test_default_agent(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_default_agent(self, parsed_v2):
+        cfg = parsed_v2
         default = cfg.get_default_agent()
         assert default is not None
         assert default.id == "analyst"
 
-    def test_default_vision_agent(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_default_vision_agent(self, parsed_v2):
+        cfg = parsed_v2
         vision = cfg.get_default_vision_agent()
         assert vision is not None
         assert vision.id == "vision-analyst"
 
-    def test_find_agent_for_model(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_find_agent_for_model(self, parsed_v2):
+        cfg = parsed_v2
         agent = cfg.find_agent_for_model("glm-4.6v")
         assert agent is not None
         assert agent.id == "vision-analyst"
+        assert cfg.find_agent_for_model("missing") is None
 
-    def test_agent_has_vision(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_agent_has_vision(self, parsed_v2):
+        cfg = parsed_v2
         assert cfg.agent_has_vision("vision-analyst") is True
         assert cfg.agent_has_vision("analyst") is False
+        assert cfg.agent_has_vision("ghost") is False
 
-    def test_conversation_inline_agents(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_conversation_inline_agents(self, parsed_v2):
+        cfg = parsed_v2
         conv = cfg.get_conversation("deep-search")
         assert conv is not None
         assert conv.type == "magentic"
         assert len(conv.inline_agents) == 2
         assert conv.inline_agents[0].id == "researcher"
+        assert conv.inline_map["researcher"] is conv.inline_agents[0]
 
-    def test_embeddings_configured(self, v2_config):
-        cfg = _parse_config(v2_config)
+    def test_embeddings_configured(self, parsed_v2):
+        cfg = parsed_v2
         assert cfg.embeddings.is_configured is True
         assert cfg.embeddings.dimensions == 2560
 
@@ -469,6 +520,7 @@ class TestParsing:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.unit
 class TestDataclasses:
     """Test individual dataclass behavior."""
 
@@ -479,14 +531,23 @@ class TestDataclasses:
         assert m.enabled is True
         assert m.context_window == 32_000
 
-    def test_model_resolve_api_key_env(self, monkeypatch):
-        monkeypatch.setenv("MY_KEY", "secret-from-env")
-        m = ModelConfig(id="test", api_key_env="MY_KEY", api_key="fallback")
-        assert m.resolve_api_key() == "secret-from-env"
-
-    def test_model_resolve_api_key_direct(self):
-        m = ModelConfig(id="test", api_key="direct-key")
-        assert m.resolve_api_key() == "direct-key"
+    @pytest.mark.parametrize(
+        "env,kwargs,expected",
+        [
+            (
+                {"MY_KEY": "secret-from-env"},
+                {"api_key_env": "MY_KEY", "api_key": "fallback"},
+                "secret-from-env",
+            ),
+            ({}, {"api_key": "direct-key"}, "direct-key"),
+        ],
+        ids=["env", "direct"],
+    )
+    def test_model_resolve_api_key(self, monkeypatch, env, kwargs, expected):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        m = ModelConfig(id="test", **kwargs)
+        assert m.resolve_api_key() == expected
 
     def test_mcp_from_dict_with_name(self):
         """MCPs with 'name' instead of 'id' should work."""
@@ -494,14 +555,24 @@ class TestDataclasses:
         assert mcp.id == "my-mcp"
         assert mcp.command == "npx"
 
-    def test_memory_config_defaults(self):
-        m = MemoryConfig()
+    @pytest.mark.parametrize(
+        "make",
+        [MemoryConfig, lambda: MemoryConfig.from_dict(None)],
+        ids=["defaults", "from_none"],
+    )
+    def test_memory_config_disabled_by_default(self, make):
+        m = make()
         assert m.enabled is False
         assert m.collection == ""
 
-    def test_memory_config_from_none(self):
-        m = MemoryConfig.from_dict(None)
-        assert m.enabled is False
+    def test_from_dict_ignores_unknown_keys(self):
+        """Unknown keys are dropped and missing keys keep dataclass defaults."""
+        q = QdrantConfig.from_dict({"port": 7000, "unexpected": True})
+        assert q.port == 7000
+        assert q.url == "http://localhost"
+        m = ModelConfig.from_dict({"id": "m1", "extra": 1})
+        assert m.model_id == "m1"
+        assert m.context_window == 32_000
 
     def test_agent_config_defaults(self):
         a = AgentConfig(id="test")
@@ -514,6 +585,14 @@ class TestDataclasses:
         assert c.type == "sequential"
         assert c.max_rounds == 10
         assert c.inline_agents == []
+        assert c.termination_marker == ""
+        assert "termination_marker" not in c.to_dict()
+
+    def test_conversation_termination_roundtrip(self):
+        data = {"id": "review", "termination_marker": "APPROVED", "termination_agent": "critic"}
+        c = ConversationConfig.from_dict(data)
+        assert c.termination_marker == "APPROVED"
+        assert c.to_dict()["termination_agent"] == "critic"
 
     def test_qdrant_config_defaults(self):
         q = QdrantConfig()
@@ -531,7 +610,7 @@ class TestLoadConfig:
 
     def test_load_missing_file(self, tmp_path):
         """Missing config file returns empty config."""
-        cfg = load_config(str(tmp_path / "nonexistent.json"))
+        cfg = load_config(tmp_path / "nonexistent.json")
         assert type(cfg).__name__ == "SKAgentConfig"
         assert cfg.models == []
         assert cfg.agents == []
@@ -542,11 +621,9 @@ class TestLoadConfig:
         assert cfg.config_version == 2
         assert len(cfg.agents) == 2  # 2 enabled models -> 2 agents
 
-    def test_load_v2_direct(self, tmp_path, v2_config):
+    def test_load_v2_direct(self, v2_file):
         """V2 file is loaded directly."""
-        path = tmp_path / "v2.json"
-        path.write_text(json.dumps(v2_config), encoding="utf-8")
-        cfg = load_config(str(path))
+        cfg = load_config(v2_file)
         assert cfg.config_version == 2
         assert len(cfg.agents) == 3
 
@@ -556,23 +633,34 @@ class TestLoadConfig:
         assert cfg.default_agent == "glm-5"
         assert cfg.default_vision_agent == "glm-4.6v"
 
+    def test_save_roundtrip(self, tmp_path, v2_base):
+        """Saved config reloads identically and omits private indexes."""
+        cfg = _parse_config(v2_base)
+        path = tmp_path / "saved.json"
+        save_config(cfg, path)
+        saved = json.loads(path.read_text(encoding="utf-8"))
+        assert "_model_map" not in saved
+        assert load_config(path).to_dict() == cfg.to_dict()
+
 
 # ---------------------------------------------------------------------------
 # Helper Tests
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.unit
 class TestHelpers:
     """Test helper functions."""
 
-    def test_infer_context_window_vision(self):
-        assert _infer_context_window({"vision": True}) == 128_000
-
-    def test_infer_context_window_cloud(self):
-        assert _infer_context_window({"base_url": "https://api.z.ai/v4"}) == 200_000
-
-    def test_infer_context_window_local(self):
-        assert _infer_context_window({"base_url": "http://localhost/v1"}) == 32_000
-
-    def test_infer_context_window_default(self):
-        assert _infer_context_window({}) == 32_000
+    @pytest.mark.parametrize(
+        "model_data,expected",
+        [
+            ({"vision": True}, 128_000),
+            ({"base_url": "https://api.z.ai/v4"}, 200_000),
+            ({"base_url": "http://localhost/v1"}, 32_000),
+            ({}, 32_000),
+        ],
+        ids=["vision", "cloud", "local", "default"],
+    )
+    def test_infer_context_window(self, model_data, expected):
+        assert _infer_context_window(model_data) == expected
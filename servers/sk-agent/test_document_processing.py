@@ -13,10 +13,13 @@ Tests cover:
 
 import io
 import json
+import logging
 import os
 import sys
 import tempfile
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -60,6 +63,43 @@ def sample_image():
     return buf.getvalue()
 
 
+@pytest.fixture(scope="session")
+def sample_docs(tmp_path_factory):
+    """Placeholder document files, written once and shared read-only."""
+    docs_dir = tmp_path_factory.mktemp("docs")
+    contents = {
+        "pdf": b"%PDF-1.4 fake",
+        "pptx": b"fake ppt",
+        "docx": b"PK fake docx",  # ZIP signature for docx
+        "xlsx": b"PK fake xlsx",
+    }
+    paths = {}
+    for ext, data in contents.items():
+        paths[ext] = docs_dir / f"test.{ext}"
+        paths[ext].write_bytes(data)
+    return paths
+
+
+@pytest.fixture
+def sample_pdf_path(sample_docs):
+    return sample_docs["pdf"]
+
+
+@pytest.fixture
+def sample_pptx_path(sample_docs):
+    return sample_docs["pptx"]
+
+
+@pytest.fixture
+def sample_docx_path(sample_docs):
+    return sample_docs["docx"]
+
+
+@pytest.fixture
+def sample_xlsx_path(sample_docs):
+    return sample_docs["xlsx"]
+
+
 # ---------------------------------------------------------------------------
 # LibreOffice Discovery Tests
 # ---------------------------------------------------------------------------
@@ -120,8 +160,9 @@ class TestLibreOfficeDiscovery:
         original_path = document_processing.LIBREOFFICE_PATH
 
         try:
-            # Clear global path
+            # Clear global path and any cached discovery
             document_processing.LIBREOFFICE_PATH = None
+            document_processing._LIBREOFFICE_CACHE.clear()
 
             # Mock shutil.which to return None (not in PATH)
             with patch.object(shutil, "which", return_value=None):
@@ -133,6 +174,30 @@ class TestLibreOfficeDiscovery:
         finally:
             document_processing.LIBREOFFICE_PATH = original_path
 
+    def test_find_libreoffice_caches_hits(self, tmp_path):
+        """Test that a found LibreOffice is reused and reset by set_libreoffice_path."""
+        import shutil
+
+        fake_lo = tmp_path / "soffice"
+        fake_lo.write_bytes(b"fake")
+        other_lo = tmp_path / "other-soffice"
+        other_lo.write_bytes(b"fake")
+
+        original_path = document_processing.LIBREOFFICE_PATH
+        try:
+            document_processing.LIBREOFFICE_PATH = None
+            document_processing._LIBREOFFICE_CACHE.clear()
+            with patch.object(shutil, "which", return_value=str(fake_lo)) as which:
+                assert _find_libreoffice() == str(fake_lo)
+                assert _find_libreoffice() == str(fake_lo)
+            assert which.call_count == 1
+
+            set_libreoffice_path(str(other_lo))
+            assert _find_libreoffice() == str(other_lo)
+        finally:
+            document_processing.LIBREOFFICE_PATH = original_path
+            document_processing._LIBREOFFICE_CACHE.clear()
+
     def test_set_libreoffice_path_valid(self, tmp_path):
         """Test setting a valid LibreOffice path."""
         fake_lo = tmp_path / "libreoffice.exe"
@@ -147,6 +212,105 @@ class TestLibreOfficeDiscovery:
         result = set_libreoffice_path(str(tmp_path / "nonexistent.exe"))
         assert result is False
 
+    def test_conversion_tmp_dir_prefers_shm(self, tmp_path):
+        """Conversion output goes to the tmpfs dir only when it exists."""
+        shm = tmp_path / "shm"
+        shm.mkdir()
+        with patch("document_processing.SHM_DIR", shm), \
+             patch("document_processing.SHM_MIN_FREE_BYTES", 0):
+            in_shm = Path(document_processing._conversion_tmp_dir("t_"))
+        with patch("document_processing.SHM_DIR", tmp_path / "missing"):
+            fallback = Path(document_processing._conversion_tmp_dir("t_"))
+
+        try:
+            assert in_shm.parent == shm
+            assert fallback.parent == Path(tempfile.gettempdir())
+        finally:
+            fallback.rmdir()
+
+
+# ---------------------------------------------------------------------------
+# PDF Conversion Tests
+# ---------------------------------------------------------------------------
+
+
+class TestPdfToImages:
+    """Test PDF rasterization."""
+
+    def test_parallel_render_preserves_page_order(self, tmp_path):
+        """Pages rendered in the process pool come back in page order."""
+        fitz = pytest.importorskip("fitz")
+        pdf_path = tmp_path / "pages.pdf"
+        doc = fitz.open()
+        for i in range(5):
+            doc.new_page(width=200, height=200).insert_text((20, 100), f"Page {i}")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        serial = _pdf_to_images(str(pdf_path), max_pages=5)
+        try:
+            with patch("document_processing._render_worker_count", return_value=2), \
+                 patch("document_processing._render_pdf_pages_parallel",
+                       wraps=document_processing._render_pdf_pages_parallel) as render:
+                parallel = _pdf_to_images(str(pdf_path), max_pages=5)
+                pool = document_processing._render_pool
+                again = _pdf_to_images(str(pdf_path), max_pages=2, start_page=3)
+        finally:
+            document_processing._shutdown_render_pool()
+
+        assert render.call_count == 2
+        assert len(set(img for img, _ in serial)) == 5
+        assert parallel == serial
+        assert again == serial[3:]
+        assert pool is not None and document_processing._render_pool is None
+
+    def test_broken_pool_falls_back_to_serial(self, tmp_path):
+        """A dead worker resets the pool and the pages render in process."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        fitz = pytest.importorskip("fitz")
+        pdf_path = tmp_path / "pages.pdf"
+        doc = fitz.open()
+        for i in range(3):
+            doc.new_page(width=200, height=200).insert_text((20, 100), f"Page {i}")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        serial = _pdf_to_images(str(pdf_path), max_pages=3)
+        pool = MagicMock()
+        pool.map.side_effect = BrokenProcessPool("worker died")
+        with patch("document_processing._render_worker_count", return_value=2), \
+             patch("document_processing._get_render_pool", return_value=pool), \
+             patch("document_processing._shutdown_render_pool") as shutdown:
+            result = _pdf_to_images(str(pdf_path), max_pages=3)
+
+        assert result == serial
+        shutdown.assert_called_once()
+
+    def test_worker_count_follows_affinity_and_cap(self):
+        cap = document_processing.PARALLEL_RENDER_MAX_WORKERS
+        with patch("document_processing.os.sched_getaffinity",
+                   return_value=set(range(64)), create=True):
+            assert document_processing._render_worker_count() == cap
+        with patch("document_processing.os.sched_getaffinity",
+                   return_value={0}, create=True):
+            assert document_processing._render_worker_count() == 1
+
+    def test_pool_is_created_once(self):
+        """The render pool is shared between calls until shut down."""
+        try:
+            with patch("document_processing.ProcessPoolExecutor") as pool_cls:
+                first = document_processing._get_render_pool()
+                second = document_processing._get_render_pool()
+            pool_cls.assert_called_once()
+            assert first is second
+            assert pool_cls.call_args.kwargs["initializer"] is (
+                document_processing._init_render_worker
+            )
+        finally:
+            document_processing._shutdown_render_pool()
+        first.shutdown.assert_called_once_with(cancel_futures=True)
+
 
 # ---------------------------------------------------------------------------
 # PowerPoint Conversion Tests
@@ -166,10 +330,9 @@ class TestPowerPointConversion:
         assert "ppt_path" in params
         assert "max_pages" in params
 
-    def test_ppt_to_images_no_libreoffice(self, tmp_path):
+    def test_ppt_to_images_no_libreoffice(self, sample_pptx_path):
         """Test error when LibreOffice is not found."""
-        fake_ppt = tmp_path / "test.pptx"
-        fake_ppt.write_bytes(b"fake ppt")
+        fake_ppt = sample_pptx_path
 
         # Mock _find_libreoffice to return None
         with patch("document_processing._find_libreoffice", return_value=None):
@@ -178,13 +341,11 @@ class TestPowerPointConversion:
 
         assert "LibreOffice" in str(exc_info.value)
 
-    def test_ppt_to_images_success_mocked(self, tmp_path):
+    def test_ppt_to_images_success_mocked(self, tmp_path, sample_pptx_path):
         """Test successful PPT conversion with mocked LibreOffice."""
         from PIL import Image
 
-        # Create fake PPT file
-        fake_ppt = tmp_path / "test.pptx"
-        fake_ppt.write_bytes(b"fake ppt")
+        fake_ppt = sample_pptx_path
 
         # Create fake LibreOffice executable
         fake_lo = tmp_path / "libreoffice.exe"
@@ -237,6 +398,21 @@ class TestPowerPointConversion:
             assert len(img_data) > 0
             assert media_type == "image/png"
 
+    def test_ppt_to_images_failure_removes_temp_dir(self, tmp_path, sample_pptx_path):
+        """A failed LibreOffice run raises and still removes the temp dir."""
+        fake_ppt = sample_pptx_path
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+
+        failed = MagicMock(returncode=1, stderr=b"boom")
+        with patch("document_processing._find_libreoffice", return_value="soffice"), \
+             patch("document_processing.tempfile.mkdtemp", return_value=str(work_dir)), \
+             patch("document_processing.subprocess.run", return_value=failed):
+            with pytest.raises(RuntimeError, match="conversion failed: boom"):
+                _ppt_to_images(str(fake_ppt))
+
+        assert not work_dir.exists()
+
 
 # ---------------------------------------------------------------------------
 # Word Document Conversion Tests
@@ -267,10 +443,9 @@ class TestWordDocumentConversion:
 
         assert "LibreOffice" in str(exc_info.value)
 
-    def test_doc_to_text_with_python_docx(self, tmp_path):
+    def test_doc_to_text_with_python_docx(self, sample_docx_path):
         """Test DOCX conversion with mocked python-docx."""
-        fake_doc = tmp_path / "test.docx"
-        fake_doc.write_bytes(b"PK fake docx")  # ZIP signature for docx
+        fake_doc = sample_docx_path
 
         # Mock _find_libreoffice to return None (force python-docx path)
         # Mock docx module
@@ -309,10 +484,9 @@ class TestExcelConversion:
         assert "xlsx_path" in params
         assert "max_sheets" in params
 
-    def test_xlsx_to_csv_with_pandas(self, tmp_path):
+    def test_xlsx_to_csv_with_pandas(self, sample_xlsx_path):
         """Test Excel conversion with mocked pandas."""
-        fake_xlsx = tmp_path / "test.xlsx"
-        fake_xlsx.write_bytes(b"PK fake xlsx")
+        fake_xlsx = sample_xlsx_path
 
         # Mock pandas
         mock_df = MagicMock()
@@ -325,7 +499,9 @@ class TestExcelConversion:
 
         mock_pd = MagicMock()
         mock_pd.ExcelFile = MagicMock(return_value=mock_excel)
-        mock_pd.read_excel = MagicMock(return_value=mock_df)
+        mock_pd.read_excel = MagicMock(
+            return_value={"Sheet1": mock_df, "Sheet2": mock_df}
+        )
 
         with patch.dict("sys.modules", {"pandas": mock_pd}):
             result = _xlsx_to_csv(str(fake_xlsx))
@@ -334,11 +510,14 @@ class TestExcelConversion:
         assert result[0][0] == "Sheet1"
         assert result[1][0] == "Sheet2"
         assert "col1,col2" in result[0][1]
+        mock_pd.read_excel.assert_called_once_with(
+            mock_excel, sheet_name=["Sheet1", "Sheet2"]
+        )
+        mock_excel.__exit__.assert_called_once()
 
-    def test_xlsx_to_csv_no_pandas_no_libreoffice(self, tmp_path):
+    def test_xlsx_to_csv_no_pandas_no_libreoffice(self, sample_xlsx_path):
         """Test error when neither pandas nor LibreOffice available."""
-        fake_xlsx = tmp_path / "test.xlsx"
-        fake_xlsx.write_bytes(b"PK fake xlsx")
+        fake_xlsx = sample_xlsx_path
 
         # Mock _find_libreoffice to return None
         with patch("document_processing._find_libreoffice", return_value=None):
@@ -407,6 +586,11 @@ class TestPageContent:
         tokens = img_page.estimate_tokens()
         assert tokens >= 100
 
+    def test_page_types_use_slots(self):
+        """PageContent and PageRange carry no per-instance __dict__."""
+        assert not hasattr(PageContent(page_number=1), "__dict__")
+        assert not hasattr(PageRange(), "__dict__")
+
 
 # ---------------------------------------------------------------------------
 # PageRange Tests
@@ -498,11 +682,9 @@ class TestUnifiedDocumentExtraction:
         assert "page_range" in params
         assert "context_window" in params
 
-    def test_extract_pdf_pages_visual_mode(self, tmp_path):
+    def test_extract_pdf_pages_visual_mode(self, sample_pdf_path):
         """Test PDF extraction in visual mode."""
-        # Create fake PDF
-        fake_pdf = tmp_path / "test.pdf"
-        fake_pdf.write_bytes(b"%PDF-1.4 fake")
+        fake_pdf = sample_pdf_path
 
         # Mock _pdf_to_images
         from PIL import Image
@@ -524,10 +706,31 @@ class TestUnifiedDocumentExtraction:
         assert len(pages) == 2
         assert all(p.has_image for p in pages)
 
-    def test_extract_doc_pages_text_mode(self, tmp_path):
+    def test_extract_pdf_pages_hybrid_opens_pdf_once_for_text(self, tmp_path):
+        """Hybrid mode reads every page's text from a single open document."""
+        fitz = pytest.importorskip("fitz")
+        pdf_path = tmp_path / "pages.pdf"
+        doc = fitz.open()
+        for i in range(3):
+            doc.new_page().insert_text((72, 72), f"Page {i}")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        images = [(b"png", "image/png")] * 2
+        with patch("document_processing._pdf_to_images", return_value=images), \
+             patch("fitz.open", wraps=fitz.open) as fitz_open:
+            pages = extract_document_pages(
+                str(pdf_path), mode="hybrid", max_pages=2,
+                page_range=PageRange(start=2, end=3),
+            )
+
+        assert fitz_open.call_count == 1
+        assert [p.page_number for p in pages] == [2, 3]
+        assert [p.text_content.strip() for p in pages] == ["Page 1", "Page 2"]
+
+    def test_extract_doc_pages_text_mode(self, sample_docx_path):
         """Test DOC extraction in text mode."""
-        fake_doc = tmp_path / "test.docx"
-        fake_doc.write_bytes(b"PK fake")
+        fake_doc = sample_docx_path
 
         with patch(
             "document_processing._doc_to_text", return_value="Document content here"
@@ -537,10 +740,9 @@ class TestUnifiedDocumentExtraction:
         assert len(pages) >= 1
         assert pages[0].has_text
 
-    def test_extract_xlsx_pages_text_mode(self, tmp_path):
+    def test_extract_xlsx_pages_text_mode(self, sample_xlsx_path):
         """Test XLSX extraction in text mode."""
-        fake_xlsx = tmp_path / "test.xlsx"
-        fake_xlsx.write_bytes(b"PK fake")
+        fake_xlsx = sample_xlsx_path
 
         with patch(
             "document_processing._xlsx_to_csv",
@@ -565,10 +767,9 @@ class TestUnifiedDocumentExtraction:
 
         assert "Unsupported" in str(exc_info.value)
 
-    def test_extract_with_page_range(self, tmp_path):
+    def test_extract_with_page_range(self, sample_pdf_path):
         """Test extraction with page range."""
-        fake_pdf = tmp_path / "test.pdf"
-        fake_pdf.write_bytes(b"%PDF-1.4 fake")
+        fake_pdf = sample_pdf_path
 
         from PIL import Image
 
@@ -596,10 +797,9 @@ class TestUnifiedDocumentExtraction:
         # Should extract 2 pages (start_page is passed to _pdf_to_images)
         assert len(pages) == 2
 
-    def test_extract_with_context_window(self, tmp_path):
+    def test_extract_with_context_window(self, sample_pdf_path):
         """Test extraction with auto-limiting by context window."""
-        fake_pdf = tmp_path / "test.pdf"
-        fake_pdf.write_bytes(b"%PDF-1.4 fake")
+        fake_pdf = sample_pdf_path
 
         from PIL import Image
 
@@ -614,7 +814,7 @@ class TestUnifiedDocumentExtraction:
             return_value=[
                 (fake_image, "image/png"),
             ],
-        ):
+        ) as mock_pdf:
             pages = extract_document_pages(
                 str(fake_pdf),
                 mode="visual",
@@ -622,8 +822,11 @@ class TestUnifiedDocumentExtraction:
                 context_window=32_000,  # Small context
             )
 
-        # Should be limited by context window
-        # Note: actual limiting depends on the mock returning fewer pages
+        # The limit is applied before rendering, not by discarding pages after
+        limit = calculate_max_pages_for_tokens(32_000, "visual")
+        assert limit < 50
+        assert mock_pdf.call_args.kwargs["max_pages"] == limit
+        assert len(pages) <= limit
 
 
 # ---------------------------------------------------------------------------
@@ -652,6 +855,143 @@ class TestDocumentToImages:
         params = list(sig.parameters.keys())
         assert "xlsx_path" in params
 
+    @staticmethod
+    def _mock_openpyxl(rows=(("Region", "Total"), ("North", 42)), formulas=None,
+                       max_row=2, max_column=2):
+        """openpyxl mock: ``rows`` hold values or (value, number_format) pairs,
+        ``formulas`` maps (row, col) to the formula of an uncached cell."""
+        formulas = formulas or {}
+
+        def cell(spec):
+            value, number_format = (
+                spec if isinstance(spec, tuple) else (spec, "General")
+            )
+            return SimpleNamespace(value=value, number_format=number_format)
+
+        value_rows = [[cell(spec) for spec in row] for row in rows]
+        formula_rows = [
+            [
+                SimpleNamespace(value=formulas[r, c], data_type="f")
+                if (r, c) in formulas
+                else SimpleNamespace(value=value.value, data_type="n")
+                for c, value in enumerate(row)
+            ]
+            for r, row in enumerate(value_rows)
+        ]
+
+        def workbook(cell_rows):
+            sheet = MagicMock(title="Sales", max_row=max_row, max_column=max_column)
+            sheet.iter_rows.return_value = cell_rows
+            return MagicMock(worksheets=[sheet])
+
+        values_wb, formulas_wb = workbook(value_rows), workbook(formula_rows)
+        mock_openpyxl = MagicMock()
+        mock_openpyxl.load_workbook.side_effect = (
+            lambda path, data_only=False: values_wb if data_only else formulas_wb
+        )
+        return mock_openpyxl
+
+    def _draw(self, mock_openpyxl, xlsx_path):
+        with patch.dict("sys.modules", {"openpyxl": mock_openpyxl}), \
+             patch("document_processing._find_libreoffice", return_value=None):
+            return _xlsx_to_images(str(xlsx_path))
+
+    def test_xlsx_to_images_renders_cells_without_libreoffice(self, sample_xlsx_path):
+        """Without LibreOffice, workbooks are drawn from openpyxl cell values."""
+        from PIL import Image
+
+        mock_openpyxl = self._mock_openpyxl()
+        result = self._draw(mock_openpyxl, sample_xlsx_path)
+
+        assert len(result) == 1
+        img_data, media_type = result[0]
+        assert media_type == "image/png"
+        img = Image.open(io.BytesIO(img_data))
+        assert img.format == "PNG"
+        # Legible: three text lines at the render font size
+        assert img.height >= 3 * document_processing.SHEET_RENDER_FONT_SIZE
+        workbooks = [
+            mock_openpyxl.load_workbook(None, data_only=flag) for flag in (True, False)
+        ]
+        for workbook in workbooks:
+            workbook.close.assert_called_once()
+
+    def test_xlsx_to_images_prefers_libreoffice(self, sample_xlsx_path):
+        """LibreOffice output is used whenever LibreOffice is installed."""
+        with patch("document_processing._find_libreoffice", return_value="soffice"), \
+             patch("document_processing._convert_with_libreoffice",
+                   side_effect=RuntimeError("LibreOffice conversion failed")), \
+             patch("document_processing._xlsx_cells_to_images") as draw_cells:
+            with pytest.raises(RuntimeError, match="conversion failed"):
+                _xlsx_to_images(str(sample_xlsx_path))
+
+        draw_cells.assert_not_called()
+
+    def test_xlsx_to_images_shows_uncached_formulas(self, sample_xlsx_path, caplog):
+        """Formulas without a cached value are shown, not drawn as blank cells."""
+        mock_openpyxl = self._mock_openpyxl(
+            rows=[("Total", None)], formulas={(0, 1): "=SUM(B2:B9)"}
+        )
+        with patch("document_processing._render_sheet_to_png",
+                   return_value=b"png") as render, \
+             caplog.at_level(logging.WARNING, logger="sk-agent.documents"):
+            self._draw(mock_openpyxl, sample_xlsx_path)
+
+        assert render.call_args.args[1] == [["Total", "=SUM(B2:B9)"]]
+        assert "1 formulas have no cached value" in caplog.text
+
+    def test_xlsx_to_images_marks_cut_sheets(self, sample_xlsx_path, caplog):
+        """Rows and columns past the render bounds are counted, not dropped silently."""
+        from PIL import Image
+
+        mock_openpyxl = self._mock_openpyxl(max_row=250, max_column=31)
+        with patch("document_processing._render_sheet_to_png",
+                   wraps=document_processing._render_sheet_to_png) as render, \
+             caplog.at_level(logging.WARNING, logger="sk-agent.documents"):
+            (img_data, _), = self._draw(mock_openpyxl, sample_xlsx_path)
+
+        assert render.call_args.args[2:] == (50, 1)
+        assert "50 more rows" in caplog.text
+        plain = document_processing._render_sheet_to_png(
+            "Sales", [["Region", "Total"], ["North", "42"]]
+        )
+        assert (
+            Image.open(io.BytesIO(img_data)).height
+            > Image.open(io.BytesIO(plain)).height
+        )
+
+    def test_sheet_cell_text_marks_cut_cells(self):
+        """Long cell values end with an ellipsis."""
+        text = document_processing._sheet_cell_text("x" * 100)
+        assert len(text) == document_processing.SHEET_RENDER_MAX_CELL_CHARS
+        assert text.endswith("...")
+        assert document_processing._sheet_cell_text(None) == ""
+        assert document_processing._sheet_cell_text(42) == "42"
+
+    @pytest.mark.parametrize(
+        "value,number_format,expected",
+        [
+            (0.1 + 0.2, "General", "0.3"),
+            (1234.5, "#,##0.00", "1,234.50"),
+            (3.14159, "0.0", "3.1"),
+            (0.256, "0%", "26%"),
+            (0.256, "0.00%", "25.60%"),
+            (12345.678, "0.00E+00", "1.23E+04"),
+            (-2.5, "0.00;[Red]-0.00", "-2.50"),
+            (datetime(2024, 3, 1), "yyyy-mm-dd", "2024-03-01"),
+            (datetime(2024, 3, 1, 9, 30), "yyyy-mm-dd hh:mm", "2024-03-01 09:30"),
+            (True, "General", "TRUE"),
+        ],
+    )
+    def test_format_cell_follows_number_format(self, value, number_format, expected):
+        assert document_processing._format_cell(value, number_format) == expected
+
+    def test_xlsx_to_images_non_latin1_needs_libreoffice(self, sample_xlsx_path):
+        """Text the default font cannot draw is not drawn as empty boxes."""
+        mock_openpyxl = self._mock_openpyxl(rows=[("Région", "合計")])
+        with pytest.raises(RuntimeError, match="requires LibreOffice"):
+            self._draw(mock_openpyxl, sample_xlsx_path)
+
 
 # ---------------------------------------------------------------------------
 # Run Tests
@@ -15,12 +15,16 @@ Tests cover:
 - Context window inference
 """
 
+import asyncio
 import io
 import json
-import os
+import logging
 import sys
 import tempfile
+from contextlib import ExitStack
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
@@ -29,7 +33,9 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent))
 
 import sk_agent
+from mcp.server.fastmcp import FastMCP
 from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.contents import AuthorRole, ChatMessageContent
 from sk_agent_config import (
     SKAgentConfig,
     AgentConfig,
@@ -43,6 +49,7 @@ from sk_agent_config import (
     migrate_config_v1_to_v2,
     get_model_context_window,
     _parse_config,
+    get_sk_agent_depth,
     DEFAULT_MAX_RECURSION_DEPTH,
 )
 from media_processing import (
@@ -87,9 +94,9 @@ def make_v1_config(**overrides) -> SKAgentConfig:
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_image():
-    """Create a sample PNG image for testing."""
+    """Create a sample PNG image for testing (encoded once; bytes are immutable)."""
     from PIL import Image
 
     img = Image.new("RGB", (100, 100), color="red")
@@ -99,10 +106,13 @@ def sample_image():
     return buf.getvalue()
 
 
-@pytest.fixture
-def text_config():
-    """Config with a single text model -> single agent."""
-    return make_v2_config(
+@pytest.fixture(scope="module")
+def text_config(check_unmutated) -> Iterator[SKAgentConfig]:
+    """Config with a single text model -> single agent.
+
+    Shared per module: do not mutate (checked at module end).
+    """
+    config = make_v2_config(
         models=[
             {
                 "id": "text-model",
@@ -114,12 +124,17 @@ def text_config():
         agents=[{"id": "text-agent", "model": "text-model"}],
         default_agent="text-agent",
     )
+    with check_unmutated(config, "text_config"):
+        yield config
 
 
-@pytest.fixture
-def vision_config():
-    """Config with text + vision models -> two agents."""
-    return make_v2_config(
+@pytest.fixture(scope="module")
+def vision_config(check_unmutated) -> Iterator[SKAgentConfig]:
+    """Config with text + vision models -> two agents.
+
+    Shared per module: do not mutate (checked at module end).
+    """
+    config = make_v2_config(
         models=[
             {
                 "id": "text-model",
@@ -147,11 +162,13 @@ def vision_config():
         default_agent="text-agent",
         default_vision_agent="vision-agent",
     )
+    with check_unmutated(config, "vision_config"):
+        yield config
 
 
-@pytest.fixture
-def isolated_config(tmp_path):
-    """Create a temporary v1 config file and set SK_AGENT_CONFIG."""
+@pytest.fixture(scope="session")
+def isolated_config_path(tmp_path_factory) -> str:
+    """A v1 config file, written once per session."""
     config_data = {
         "default_ask_model": "test-model",
         "default_vision_model": "test-vision",
@@ -179,19 +196,22 @@ def isolated_config(tmp_path):
         "mcps": [],
         "system_prompt": "Test prompt",
     }
-    config_file = tmp_path / "test_config.json"
+    config_file = tmp_path_factory.mktemp("config") / "test_config.json"
     config_file.write_text(json.dumps(config_data))
+    return str(config_file)
 
-    old_env = os.environ.get("SK_AGENT_CONFIG")
-    os.environ["SK_AGENT_CONFIG"] = str(config_file)
 
-    yield str(config_file)
+@pytest.fixture(scope="session")
+def loaded_v1_config(
+    isolated_config_path, check_unmutated
+) -> Iterator[SKAgentConfig]:
+    """load_config() result for the v1 config file.
 
-    # Cleanup
-    if old_env:
-        os.environ["SK_AGENT_CONFIG"] = old_env
-    elif "SK_AGENT_CONFIG" in os.environ:
-        del os.environ["SK_AGENT_CONFIG"]
+    Shared: do not mutate (checked at session end).
+    """
+    config = load_config(isolated_config_path)
+    with check_unmutated(config, "loaded_v1_config"):
+        yield config
 
 
 # ---------------------------------------------------------------------------
@@ -206,9 +226,9 @@ class TestConfigLoading:
     def test_load_config_missing_file(self, tmp_path):
         pass
 
-    def test_load_config_valid_file(self, isolated_config):
+    def test_load_config_valid_file(self, loaded_v1_config):
         """Test loading a valid v1 config file (auto-migrates to v2)."""
-        config = load_config(isolated_config)
+        config = loaded_v1_config
 
         assert type(config).__name__ == "SKAgentConfig"
         assert len(config.models) == 2
@@ -232,35 +252,31 @@ class TestConfigLoading:
 class TestAttachmentClassification:
     """Tests for classify_attachment()."""
 
-    def test_image_extensions(self):
-        assert sk_agent.classify_attachment("photo.png") == "image"
-        assert sk_agent.classify_attachment("photo.jpg") == "image"
-        assert sk_agent.classify_attachment("photo.JPEG") == "image"
-        assert sk_agent.classify_attachment("photo.webp") == "image"
-
-    def test_video_extensions(self):
-        assert sk_agent.classify_attachment("clip.mp4") == "video"
-        assert sk_agent.classify_attachment("clip.avi") == "video"
-        assert sk_agent.classify_attachment("clip.MOV") == "video"
-
-    def test_document_extensions(self):
-        assert sk_agent.classify_attachment("doc.pdf") == "document"
-        assert sk_agent.classify_attachment("doc.pptx") == "document"
-        assert sk_agent.classify_attachment("doc.docx") == "document"
-        assert sk_agent.classify_attachment("doc.xlsx") == "document"
-
-    def test_unknown_extension(self):
-        assert sk_agent.classify_attachment("file.txt") is None
-        assert sk_agent.classify_attachment("file.py") is None
-        assert sk_agent.classify_attachment("") is None
-
-    def test_url_classification(self):
-        assert sk_agent.classify_attachment("https://example.com/photo.png") == "image"
-        assert sk_agent.classify_attachment("https://example.com/video.mp4") == "video"
-        assert (
-            sk_agent.classify_attachment("https://example.com/report.pdf") == "document"
-        )
-        assert sk_agent.classify_attachment("https://example.com/page") is None
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("photo.png", "image"),
+            ("photo.jpg", "image"),
+            ("photo.JPEG", "image"),
+            ("photo.webp", "image"),
+            ("clip.mp4", "video"),
+            ("clip.avi", "video"),
+            ("clip.MOV", "video"),
+            ("doc.pdf", "document"),
+            ("doc.pptx", "document"),
+            ("doc.docx", "document"),
+            ("doc.xlsx", "document"),
+            ("file.txt", None),
+            ("file.py", None),
+            ("", None),
+            ("https://example.com/photo.png", "image"),
+            ("https://example.com/video.mp4", "video"),
+            ("https://example.com/report.pdf", "document"),
+            ("https://example.com/page", None),
+        ],
+    )
+    def test_classify_attachment(self, name, expected):
+        assert sk_agent.classify_attachment(name) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -281,7 +297,7 @@ class TestImageProcessing:
         """Test that large images are resized."""
         from PIL import Image
 
-        img = Image.new("RGB", (2000, 2000), color="blue")
+        img = Image.new("RGB", (800, 800), color="blue")
         buf = io.BytesIO()
         img.save(buf, format="PNG")
         large_data = buf.getvalue()
@@ -289,10 +305,12 @@ class TestImageProcessing:
         resized_data, media_type = _resize_image_if_needed(
             large_data,
             "image/png",
-            max_bytes=100_000,
-            max_pixels=500_000,
+            max_bytes=20_000,
+            max_pixels=100_000,
         )
-        assert len(resized_data) <= 100_000
+        assert len(resized_data) <= 20_000
+        width, height = Image.open(io.BytesIO(resized_data)).size
+        assert width * height <= 100_000
 
     def test_crop_image_pixels(self, sample_image):
         """Test image cropping with pixel values."""
@@ -333,14 +351,27 @@ class TestRecursionDepth:
     def test_sk_agent_depth_env_var(self, monkeypatch):
         """Test SK_AGENT_DEPTH environment variable."""
         monkeypatch.setenv("SK_AGENT_DEPTH", "3")
-        import importlib
-        import sk_agent_config
+        assert get_sk_agent_depth() == 3
 
-        importlib.reload(sk_agent_config)
-        assert sk_agent_config.SK_AGENT_DEPTH == 3
-        # Cleanup
         monkeypatch.delenv("SK_AGENT_DEPTH")
-        importlib.reload(sk_agent_config)
+        assert get_sk_agent_depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_self_inclusion_spawns_child_one_level_deeper(self, monkeypatch):
+        """The child depth follows the current environment, not import time."""
+        config = make_v2_config(
+            mcps=[{"id": "sk-agent", "command": "python", "args": ["sk_agent.py"]}],
+        )
+        manager = sk_agent.SKAgentManager(config)
+        monkeypatch.setenv("SK_AGENT_DEPTH", "1")
+
+        with patch("sk_agent.MCPStdioPlugin") as MockPlugin:
+            MockPlugin.return_value.__aenter__ = AsyncMock()
+            MockPlugin.return_value.__aexit__ = AsyncMock(return_value=False)
+            assert await manager._ensure_mcp_loaded("sk-agent")
+            await manager.stop()
+
+        assert MockPlugin.call_args.kwargs["env"]["SK_AGENT_DEPTH"] == "2"
 
 
 # ---------------------------------------------------------------------------
@@ -361,6 +392,44 @@ class TestSKAgentManager:
         assert manager._kernels == {}
         assert manager._threads == {}
 
+    @pytest.mark.asyncio
+    async def test_model_clients_share_http_pool(self):
+        config = make_v2_config(
+            models=[
+                {"id": "m1", "base_url": "http://test/v1", "model_id": "v1"},
+                {"id": "m2", "base_url": "http://test/v1", "model_id": "v2"},
+            ],
+        )
+        manager = sk_agent.SKAgentManager(config)
+        await manager.start()
+
+        http_client = manager._get_http_client()
+        assert all(
+            c._client is http_client for c in manager._openai_clients.values()
+        )
+        await manager.stop()
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_response_cache_embeds_through_http_pool(self):
+        config = make_v2_config(
+            embeddings={
+                "base_url": "https://embeddings.test/v1",
+                "api_key": "test-emb-key",
+                "model_id": "test-embedding-model",
+            },
+        )
+        manager = sk_agent.SKAgentManager(config)
+
+        with patch("sk_agent.AsyncOpenAI") as MockClient:
+            cache = manager.build_response_cache()
+
+        assert cache._embed is not None
+        http_client = manager._get_http_client()
+        assert MockClient.call_args.kwargs["http_client"] is http_client
+        await manager.stop()
+        assert http_client.is_closed
+
     def test_init_with_config(self, vision_config):
         """Test SKAgentManager stores config, agents not created until start()."""
         manager = sk_agent.SKAgentManager(vision_config)
@@ -565,11 +634,8 @@ class TestCallAgent:
         mock_agent.invoke = fake_invoke
         manager._sk_agents = {"text-agent": MagicMock(), "vision-agent": mock_agent}
 
-        from PIL import Image
-
         img_path = tmp_path / "test.png"
-        img = Image.open(io.BytesIO(sample_image))
-        img.save(img_path)
+        img_path.write_bytes(sample_image)
 
         result = await manager.call_agent("Describe this", attachment=str(img_path))
         assert result["agent_used"] == "vision-agent"
@@ -814,9 +880,9 @@ class TestVideoAnalysis:
                     f.write(fake_frame)
             return result
 
-        with patch("media_processing._get_video_info", return_value=mock_video_info):
-            with patch("media_processing.subprocess.run", side_effect=mock_run):
-                frames = _extract_video_frames(str(fake_video), num_frames=2)
+        with patch("media_processing._get_video_info", return_value=mock_video_info), \
+             patch("media_processing.subprocess.run", side_effect=mock_run):
+            frames = _extract_video_frames(str(fake_video), num_frames=2)
 
         assert len(frames) == 2
 
@@ -846,17 +912,19 @@ class TestVideoAnalysis:
         img.save(buf, format="JPEG")
         fake_frame = buf.getvalue()
 
-        with patch("sk_agent._get_video_info", return_value=None):
-            with patch(
-                "sk_agent._extract_keyframes",
+        with patch.multiple(
+            "sk_agent",
+            _get_video_info=MagicMock(return_value=None),
+            _extract_keyframes=MagicMock(
                 return_value=[
                     (fake_frame, "image/jpeg"),
                     (fake_frame, "image/jpeg"),
-                ],
-            ):
-                result = await manager.call_agent(
-                    "Describe video", attachment=str(fake_video)
-                )
+                ]
+            ),
+        ):
+            result = await manager.call_agent(
+                "Describe video", attachment=str(fake_video)
+            )
 
         assert result.get("agent_used") == "vision-agent"
         assert result.get("frames_analyzed") == 2
@@ -933,32 +1001,32 @@ class TestContextWindow:
 class TestBackwardCompatibility:
     """Tests verifying v1 configs work correctly through the v2 stack."""
 
-    def test_v1_config_creates_agents(self, isolated_config):
+    def test_v1_config_creates_agents(self, loaded_v1_config):
         """V1 config with models auto-creates agents."""
-        config = load_config(isolated_config)
+        config = loaded_v1_config
 
         assert type(config).__name__ == "SKAgentConfig"
         assert len(config.agents) == 2
 
-    def test_v1_default_ask_becomes_default_agent(self, isolated_config):
+    def test_v1_default_ask_becomes_default_agent(self, loaded_v1_config):
         """V1 default_ask_model maps to default_agent."""
-        config = load_config(isolated_config)
+        config = loaded_v1_config
 
         default = config.get_default_agent()
         assert default is not None
         assert default.id == "test-model"
 
-    def test_v1_default_vision_becomes_default_vision_agent(self, isolated_config):
+    def test_v1_default_vision_becomes_default_vision_agent(self, loaded_v1_config):
         """V1 default_vision_model maps to default_vision_agent."""
-        config = load_config(isolated_config)
+        config = loaded_v1_config
 
         vision = config.get_default_vision_agent()
         assert vision is not None
         assert vision.id == "test-vision"
 
-    def test_manager_list_agents_with_v1_config(self, isolated_config):
+    def test_manager_list_agents_with_v1_config(self, loaded_v1_config):
         """Manager works correctly with auto-migrated v1 config."""
-        config = load_config(isolated_config)
+        config = loaded_v1_config
         manager = sk_agent.SKAgentManager(config)
 
         agents = manager.list_agents()
@@ -974,6 +1042,9 @@ class TestBackwardCompatibility:
 
 from sk_conversations import (
     ConversationRunner,
+    MarkerTerminationStrategy,
+    RequestScopedToolCache,
+    ResponseCache,
     PRESETS,
     DEEP_SEARCH_PRESET,
     DEEP_THINK_PRESET,
@@ -1024,153 +1095,78 @@ class TestMemorySetup:
             **kwargs,
         )
 
-    @pytest.mark.asyncio
-    async def test_setup_memory_returns_none_without_embeddings(self):
-        """_setup_memory returns None when embeddings not configured."""
-        config = self._make_memory_config(embeddings=False)
-        manager = sk_agent.SKAgentManager(config)
-        agent_cfg = config.agents[0]
-        kernel = MagicMock()
-
-        result = await manager._setup_memory(agent_cfg, kernel)
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_setup_memory_creates_qdrant_store(self):
-        """_setup_memory creates QdrantMemoryStore when available."""
-        config = self._make_memory_config()
-        manager = sk_agent.SKAgentManager(config)
-        agent_cfg = config.agents[0]
-        kernel = MagicMock()
-
-        with patch.object(sk_agent, "HAS_QDRANT", True), patch.object(
-            sk_agent, "HAS_MEMORY", True
-        ), patch("sk_agent.QdrantMemoryStore") as MockQdrant, patch(
-            "sk_agent.SemanticTextMemory"
-        ) as MockMemory, patch(
-            "sk_agent.TextMemoryPlugin"
-        ) as MockPlugin, patch(
-            "sk_agent.OpenAITextEmbedding"
-        ) as MockEmb, patch(
-            "sk_agent.AsyncOpenAI"
-        ):
-            MockQdrant.return_value = MagicMock()
-            MockMemory.return_value = MagicMock()
-            MockPlugin.return_value = MagicMock()
-            MockEmb.return_value = MagicMock()
-
-            result = await manager._setup_memory(agent_cfg, kernel)
-
-            assert result is not None
-            MockQdrant.assert_called_once()
-            # Verify Qdrant params
-            call_kwargs = MockQdrant.call_args.kwargs
-            assert call_kwargs["vector_size"] == 1024
-            assert call_kwargs["url"] == "https://qdrant.test"
-            assert call_kwargs["port"] == 443
-            assert call_kwargs["api_key"] == "test-qdrant-key"
-
-    @pytest.mark.asyncio
-    async def test_setup_memory_falls_back_to_volatile(self):
-        """_setup_memory uses VolatileMemoryStore when Qdrant unavailable."""
-        config = self._make_memory_config()
-        manager = sk_agent.SKAgentManager(config)
-        agent_cfg = config.agents[0]
-        kernel = MagicMock()
-
-        with patch.object(sk_agent, "HAS_QDRANT", False), patch.object(
-            sk_agent, "HAS_MEMORY", True
-        ), patch("sk_agent.VolatileMemoryStore") as MockVolatile, patch(
-            "sk_agent.SemanticTextMemory"
-        ) as MockMemory, patch(
-            "sk_agent.TextMemoryPlugin"
-        ) as MockPlugin, patch(
-            "sk_agent.OpenAITextEmbedding"
-        ) as MockEmb, patch(
-            "sk_agent.AsyncOpenAI"
-        ):
-            MockVolatile.return_value = MagicMock()
-            MockMemory.return_value = MagicMock()
-            MockPlugin.return_value = MagicMock()
-            MockEmb.return_value = MagicMock()
-
-            result = await manager._setup_memory(agent_cfg, kernel)
-
-            assert result is not None
-            MockVolatile.assert_called_once()
+    @pytest.fixture
+    def memory_patches(self, monkeypatch):
+        """Patch _setup_memory's dependencies (Qdrant and memory available)."""
+        monkeypatch.setattr(sk_agent, "HAS_QDRANT", True)
+        monkeypatch.setattr(sk_agent, "HAS_MEMORY", True)
+        targets = {
+            "qdrant": "QdrantMemoryStore",
+            "volatile": "VolatileMemoryStore",
+            "memory": "SemanticTextMemory",
+            "plugin": "TextMemoryPlugin",
+            "emb": "OpenAITextEmbedding",
+            "client": "AsyncOpenAI",
+        }
+        with ExitStack() as stack:
+            yield SimpleNamespace(
+                **{
+                    key: stack.enter_context(patch(f"sk_agent.{name}"))
+                    for key, name in targets.items()
+                }
+            )
 
     @pytest.mark.asyncio
-    async def test_setup_memory_collection_naming(self):
-        """Memory collection uses prefix-collection format."""
-        config = self._make_memory_config()
+    @pytest.mark.parametrize(
+        "embeddings,has_qdrant,qdrant_error,store",
+        [
+            (False, True, None, None),
+            (True, True, None, "qdrant"),
+            (True, False, None, "volatile"),
+            (True, True, Exception("Connection refused"), None),
+        ],
+        ids=["no_embeddings", "qdrant", "volatile_fallback", "qdrant_exception"],
+    )
+    async def test_setup_memory(
+        self, memory_patches, monkeypatch, embeddings, has_qdrant, qdrant_error, store
+    ):
+        """_setup_memory picks a store, or returns None without crashing."""
+        monkeypatch.setattr(sk_agent, "HAS_QDRANT", has_qdrant)
+        memory_patches.qdrant.side_effect = qdrant_error
+        config = self._make_memory_config(embeddings=embeddings)
         manager = sk_agent.SKAgentManager(config)
         agent_cfg = config.agents[0]
-        kernel = MagicMock()
 
-        with patch.object(sk_agent, "HAS_QDRANT", True), patch.object(
-            sk_agent, "HAS_MEMORY", True
-        ), patch("sk_agent.QdrantMemoryStore") as MockQdrant, patch(
-            "sk_agent.SemanticTextMemory"
-        ) as MockMemory, patch(
-            "sk_agent.TextMemoryPlugin"
-        ) as MockPlugin, patch(
-            "sk_agent.OpenAITextEmbedding"
-        ), patch(
-            "sk_agent.AsyncOpenAI"
-        ):
-            MockQdrant.return_value = MagicMock()
-            mock_memory = MagicMock()
-            MockMemory.return_value = mock_memory
-            MockPlugin.return_value = MagicMock()
-
-            await manager._setup_memory(agent_cfg, kernel)
+        result = await manager._setup_memory(agent_cfg, MagicMock())
 
-            # Verify collection is stored
-            assert "mem-agent" in manager._memory_stores
-            assert manager._memory_stores["mem-agent"] is mock_memory
+        if store is None:
+            assert result is None
+            assert "mem-agent" not in manager._memory_stores
+            return
+
+        assert result is memory_patches.plugin.return_value
+        getattr(memory_patches, store).assert_called_once()
+        other = "volatile" if store == "qdrant" else "qdrant"
+        getattr(memory_patches, other).assert_not_called()
+        # Memory is registered per agent, with the configured embedding model
+        assert manager._memory_stores["mem-agent"] is memory_patches.memory.return_value
+        memory_patches.emb.assert_called_once()
+        call_kwargs = memory_patches.emb.call_args.kwargs
+        assert call_kwargs["ai_model_id"] == "test-embedding-model"
 
     @pytest.mark.asyncio
-    async def test_setup_memory_creates_embeddings_generator(self):
-        """_setup_memory creates OpenAITextEmbedding with correct config."""
+    async def test_setup_memory_qdrant_params(self, memory_patches):
+        """QdrantMemoryStore gets the embedding size and Qdrant connection."""
         config = self._make_memory_config()
         manager = sk_agent.SKAgentManager(config)
-        agent_cfg = config.agents[0]
-        kernel = MagicMock()
-
-        with patch.object(sk_agent, "HAS_QDRANT", True), patch.object(
-            sk_agent, "HAS_MEMORY", True
-        ), patch("sk_agent.QdrantMemoryStore"), patch(
-            "sk_agent.SemanticTextMemory"
-        ) as MockMemory, patch(
-            "sk_agent.TextMemoryPlugin"
-        ), patch(
-            "sk_agent.OpenAITextEmbedding"
-        ) as MockEmb, patch(
-            "sk_agent.AsyncOpenAI"
-        ) as MockClient:
-            MockEmb.return_value = MagicMock()
-            MockMemory.return_value = MagicMock()
-
-            await manager._setup_memory(agent_cfg, kernel)
-
-            MockEmb.assert_called_once()
-            assert MockEmb.call_args.kwargs["ai_model_id"] == "test-embedding-model"
 
-    @pytest.mark.asyncio
-    async def test_setup_memory_exception_returns_none(self):
-        """_setup_memory returns None on exception (does not crash)."""
-        config = self._make_memory_config()
-        manager = sk_agent.SKAgentManager(config)
-        agent_cfg = config.agents[0]
-        kernel = MagicMock()
+        await manager._setup_memory(config.agents[0], MagicMock())
 
-        with patch.object(sk_agent, "HAS_QDRANT", True), patch.object(
-            sk_agent, "HAS_MEMORY", True
-        ), patch(
-            "sk_agent.QdrantMemoryStore", side_effect=Exception("Connection refused")
-        ):
-            result = await manager._setup_memory(agent_cfg, kernel)
-            assert result is None
+        call_kwargs = memory_patches.qdrant.call_args.kwargs
+        assert call_kwargs["vector_size"] == 1024
+        assert call_kwargs["url"] == "https://qdrant.test"
+        assert call_kwargs["port"] == 443
+        assert call_kwargs["api_key"] == "test-qdrant-key"
 
     def test_memory_prompt_augmentation(self):
         """Agent with memory gets prompt augmented with memory hint."""
@@ -1339,6 +1335,60 @@ class TestConversationExecution:
         assert result["steps"][1]["agent"] == "sk-agent-agent-b"
         assert result["response"] == "Response B1"  # Last response
 
+    @pytest.mark.asyncio
+    async def test_run_group_chat_on_step_and_bounded_steps(self):
+        """on_step sees full steps; stored steps are truncated and windowed."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["agent-a", "agent-b"],
+            config_conversations=[
+                {
+                    "id": "test-conv",
+                    "description": "Test",
+                    "type": "group_chat",
+                    "agents": ["agent-a", "agent-b"],
+                    "max_rounds": 4,
+                }
+            ],
+        )
+        contents = ["short", "x" * 50, "y" * 50]
+        mock_messages = []
+        for i, text in enumerate(contents):
+            msg = MagicMock(content=text, role=MagicMock())
+            msg.name = f"sk-agent-{i}"
+            mock_messages.append(msg)
+
+        seen = []
+
+        async def on_step(step):
+            seen.append(step["content"])
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                for msg in mock_messages:
+                    yield msg
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            result = await runner.run(
+                "test prompt",
+                conversation_id="test-conv",
+                options={"on_step": on_step, "max_step_chars": 10, "keep_last_n": 2},
+            )
+
+        assert seen == contents
+        assert result["rounds"] == 3
+        assert [s["agent"] for s in result["steps"]] == ["sk-agent-1", "sk-agent-2"]
+        assert result["steps"][1] == {
+            "agent": "sk-agent-2",
+            "content": "y" * 10,
+            "truncated": True,
+        }
+        assert result["response"] == "y" * 50
+
     @pytest.mark.asyncio
     async def test_run_sequential_limits_to_agent_count(self):
         """Sequential conversation sets max_iterations to number of agents."""
@@ -1402,7 +1452,7 @@ class TestConversationExecution:
 
             mock_agent.invoke = fake_invoke
 
-        with patch("semantic_kernel.agents.ChatHistoryAgentThread") as MockThread:
+        with patch("sk_conversations.ChatHistoryAgentThread") as MockThread:
             MockThread.return_value = MagicMock()
             result = await runner.run("test", conversation_id="concurrent-conv")
 
@@ -1411,136 +1461,623 @@ class TestConversationExecution:
         assert result["rounds"] == 1
         assert len(result["steps"]) == 2
 
-    @pytest.mark.asyncio
-    async def test_run_with_max_rounds_override(self):
-        """Options can override max_rounds."""
+    def _make_concurrent_runner(self, agent_names, delays):
+        """Runner whose agents answer after the given delays, tracking overlap."""
         runner, agents = self._make_runner_with_agents(
-            agent_names=["a"],
+            agent_names=agent_names,
             config_conversations=[
                 {
-                    "id": "gc",
-                    "description": "Test",
-                    "type": "group_chat",
-                    "agents": ["a"],
-                    "max_rounds": 6,
+                    "id": "concurrent-conv",
+                    "description": "Concurrent test",
+                    "type": "concurrent",
+                    "agents": agent_names,
                 }
             ],
         )
+        state = {"inflight": 0, "peak": 0}
+        for name, delay in zip(agent_names, delays):
 
-        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
-            "sk_conversations.DefaultTerminationStrategy"
-        ) as MockTermination:
-            mock_chat_instance = MagicMock()
+            async def fake_invoke(messages=None, thread=None, _name=name, _delay=delay):
+                state["inflight"] += 1
+                state["peak"] = max(state["peak"], state["inflight"])
+                await asyncio.sleep(_delay)
+                state["inflight"] -= 1
+                yield f"Response from {_name}"
 
-            async def fake_invoke():
-                return
-                yield
+            agents[name].invoke = fake_invoke
+        return runner, state
 
-            mock_chat_instance.invoke = fake_invoke
-            mock_chat_instance.add_chat_message = AsyncMock()
-            MockChat.return_value = mock_chat_instance
+    @pytest.mark.asyncio
+    async def test_run_concurrent_reports_results_as_they_finish(self):
+        """on_result sees completion order; returned steps keep agent order."""
+        runner, state = self._make_concurrent_runner(["slow", "fast"], [0.05, 0])
+        seen = []
+
+        result = await runner.run(
+            "test",
+            conversation_id="concurrent-conv",
+            options={"on_result": lambda step: seen.append(step["agent"])},
+        )
 
-            await runner.run("test", conversation_id="gc", options={"max_rounds": 20})
+        assert seen == ["sk-agent-fast", "sk-agent-slow"]
+        assert [s["agent"] for s in result["steps"]] == [
+            "sk-agent-slow",
+            "sk-agent-fast",
+        ]
+        assert result["response"] == (
+            "**sk-agent-slow**: Response from slow"
+            "\n\n---\n\n"
+            "**sk-agent-fast**: Response from fast"
+        )
+        assert state["peak"] == 2
 
-            call_kwargs = MockTermination.call_args.kwargs
-            assert call_kwargs["maximum_iterations"] == 20
+    @pytest.mark.asyncio
+    async def test_run_concurrent_first_valid_cancels_the_rest(self):
+        runner, _ = self._make_concurrent_runner(["slow", "fast"], [5, 0])
+
+        result = await asyncio.wait_for(
+            runner.run(
+                "test", conversation_id="concurrent-conv", options={"mode": "first_valid"}
+            ),
+            timeout=1,
+        )
+
+        assert [s["agent"] for s in result["steps"]] == ["sk-agent-fast"]
+        assert result["response"] == "**sk-agent-fast**: Response from fast"
 
     @pytest.mark.asyncio
-    async def test_run_magentic_tries_kernel_function_selection(self):
-        """Magentic conversation tries KernelFunctionSelectionStrategy."""
-        runner, agents = self._make_runner_with_agents(
-            agent_names=["researcher", "synthesizer"],
-            config_conversations=[
-                {
-                    "id": "mag-conv",
-                    "description": "Magentic test",
-                    "type": "magentic",
-                    "agents": ["researcher", "synthesizer"],
-                }
-            ],
+    async def test_run_concurrent_quorum_stops_at_majority(self):
+        runner, _ = self._make_concurrent_runner(["a", "b", "c"], [0, 0.01, 5])
+
+        result = await asyncio.wait_for(
+            runner.run(
+                "test",
+                conversation_id="concurrent-conv",
+                options={"mode": "quorum"},
+            ),
+            timeout=1,
         )
 
-        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
-            "semantic_kernel.agents.strategies.KernelFunctionSelectionStrategy"
-        ) as MockKFS, patch(
-            "semantic_kernel.functions.KernelFunctionFromPrompt"
-        ) as MockKFP:
-            MockKFS.return_value = MagicMock()
-            MockKFP.return_value = MagicMock()
+        assert [s["agent"] for s in result["steps"]] == ["sk-agent-a", "sk-agent-b"]
 
-            mock_chat_instance = MagicMock()
+    @pytest.mark.asyncio
+    async def test_run_concurrent_unknown_mode(self):
+        runner, _ = self._make_concurrent_runner(["a"], [0])
 
-            async def fake_invoke():
-                return
-                yield
+        result = await runner.run(
+            "test", conversation_id="concurrent-conv", options={"mode": "fastest"}
+        )
 
-            mock_chat_instance.invoke = fake_invoke
-            mock_chat_instance.add_chat_message = AsyncMock()
-            MockChat.return_value = mock_chat_instance
+        assert "Unknown concurrent mode" in result["error"]
 
-            await runner.run("test", conversation_id="mag-conv")
+    @pytest.mark.asyncio
+    async def test_run_concurrent_max_inflight(self):
+        """max_inflight bounds how many agents run at once."""
+        runner, state = self._make_concurrent_runner(["a", "b", "c"], [0.01] * 3)
 
-            # Verify KernelFunctionSelectionStrategy was attempted
-            MockKFS.assert_called_once()
+        result = await runner.run(
+            "test", conversation_id="concurrent-conv", options={"max_inflight": 1}
+        )
+
+        assert len(result["steps"]) == 3
+        assert state["peak"] == 1
 
     @pytest.mark.asyncio
-    async def test_run_handles_agent_exception(self):
-        """Conversation returns error dict when agent raises."""
+    async def test_run_concurrent_default_inflight_cap(self):
+        names = [f"a{i}" for i in range(10)]
+        runner, state = self._make_concurrent_runner(names, [0.01] * 10)
+
+        with patch("sk_conversations._DEFAULT_MAX_INFLIGHT", 4):
+            result = await runner.run("test", conversation_id="concurrent-conv")
+
+        assert len(result["steps"]) == 10
+        assert state["peak"] == 4
+
+    @pytest.mark.asyncio
+    async def test_warm_up_uses_common_instruction_prefix(self):
+        """Agents whose instructions share a long prefix warm that prefix once."""
+        runner, agents = self._make_runner_with_agents(agent_names=["a", "b", "c"])
+        shared = "Shared policy. " * 50
+        kernel = MagicMock()
+        for name, agent in agents.items():
+            agent.kernel = kernel
+            agent.instructions = shared + f"You are {name}."
+        agents["c"].kernel = MagicMock()  # alone on its endpoint
+
+        with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
+            warmer = MockAgent.return_value
+            calls = []
+
+            async def fake_invoke(messages=None, thread=None, arguments=None):
+                calls.append(arguments)
+                yield "ok"
+
+            warmer.invoke = fake_invoke
+            await runner._warm_shared_prefix("test", list(agents.values()))
+
+        assert MockAgent.call_args.kwargs["instructions"] == shared + "You are "
+        assert MockAgent.call_args.kwargs["kernel"] is kernel
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_warm_up_skipped_for_short_common_prefix(self):
+        runner, agents = self._make_runner_with_agents(agent_names=["a", "b"])
+        kernel = MagicMock()
+        for name, agent in agents.items():
+            agent.kernel = kernel
+            agent.instructions = f"You are {name}."
+
+        with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
+            await runner._warm_shared_prefix("test", list(agents.values()))
+
+        MockAgent.assert_not_called()
+        for agent in agents.values():
+            agent.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_concurrent_retries_transient_errors(self):
+        """Transient failures are retried; permanent ones keep the agent name."""
+        import httpx
+
         runner, agents = self._make_runner_with_agents(
-            agent_names=["a"],
+            agent_names=["flaky", "broken"],
             config_conversations=[
-                {
-                    "id": "fail-conv",
-                    "description": "Failing",
-                    "type": "group_chat",
-                    "agents": ["a"],
-                }
+                {"id": "cc", "type": "concurrent", "agents": ["flaky", "broken"]}
             ],
         )
+        attempts = {"flaky": 0, "broken": 0}
 
-        with patch("sk_conversations.AgentGroupChat") as MockChat:
-            MockChat.side_effect = Exception("SK initialization error")
+        async def flaky_invoke(messages=None, thread=None):
+            attempts["flaky"] += 1
+            if attempts["flaky"] == 1:
+                raise RuntimeError("service failed") from httpx.ConnectError("reset")
+            yield "recovered"
 
-            result = await runner.run("test", conversation_id="fail-conv")
+        async def broken_invoke(messages=None, thread=None):
+            attempts["broken"] += 1
+            raise ValueError("bad request")
+            yield
 
-            assert "error" in result
-            assert "SK initialization error" in result["error"]
+        agents["flaky"].invoke = flaky_invoke
+        agents["broken"].invoke = broken_invoke
+
+        with patch("sk_conversations._RETRY_BASE_DELAY", 0):
+            result = await runner.run("test", conversation_id="cc")
+
+        flaky, broken = result["steps"]
+        assert flaky == {"agent": "sk-agent-flaky", "response": "recovered"}
+        assert broken["agent"] == "sk-agent-broken"
+        assert broken["error"] == "bad request"
+        assert broken["retries"] == 0
+        assert attempts == {"flaky": 2, "broken": 1}
 
     @pytest.mark.asyncio
-    async def test_run_with_inline_agents(self):
-        """Conversations with inline agents create agents on the fly."""
-        config = make_v2_config(
-            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
-            agents=[{"id": "base", "model": "m1"}],
-            default_agent="base",
-            conversations=[
-                {
-                    "id": "inline-conv",
-                    "description": "With inline",
-                    "type": "sequential",
-                    "agents": ["inline-a", "inline-b"],
-                    "inline_agents": [
-                        {
-                            "id": "inline-a",
-                            "model": "m1",
-                            "system_prompt": "You are A.",
-                        },
-                        {
-                            "id": "inline-b",
-                            "model": "m1",
-                            "system_prompt": "You are B.",
-                        },
-                    ],
-                }
+    async def test_run_concurrent_leaves_sdk_errors_to_the_sdk(self):
+        """Errors from the OpenAI client were already retried by the SDK."""
+        import httpx
+        import openai
+
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["limited"],
+            config_conversations=[
+                {"id": "cc", "type": "concurrent", "agents": ["limited"]}
             ],
         )
+        attempts = []
+        request = httpx.Request("POST", "http://test/v1/chat/completions")
+        rate_limited = openai.RateLimitError(
+            "rate limited", response=httpx.Response(429, request=request), body=None
+        )
 
-        mock_kernel = MagicMock()
-        mock_base = MagicMock(spec=ChatCompletionAgent)
-        mock_base.name = "sk-agent-base"
-        mock_base.kernel = mock_kernel
+        async def limited_invoke(messages=None, thread=None):
+            attempts.append(1)
+            raise RuntimeError("service failed") from rate_limited
+            yield
 
-        runner = ConversationRunner(config, {"base": mock_base})
+        agents["limited"].invoke = limited_invoke
+
+        with patch("sk_conversations._RETRY_BASE_DELAY", 0):
+            result = await runner.run("test", conversation_id="cc")
+
+        assert result["steps"][0]["retries"] == 0
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_run_concurrent_shares_user_message(self):
+        """Agents get the same prompt message but their own threads."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a", "b"],
+            config_conversations=[
+                {"id": "cc", "type": "concurrent", "agents": ["a", "b"]}
+            ],
+        )
+        calls = []
+        for agent in agents.values():
+
+            async def fake_invoke(messages=None, thread=None, arguments=None):
+                calls.append((messages, thread))
+                yield "ok"
+
+            agent.invoke = fake_invoke
+
+        await runner.run("test", conversation_id="cc", options={"prefix_warm": False})
+
+        (msg_a, thread_a), (msg_b, thread_b) = calls
+        assert msg_a is msg_b
+        assert msg_a.content == "test"
+        assert thread_a is not thread_b
+
+    @pytest.mark.asyncio
+    async def test_run_concurrent_warms_shared_prefix(self):
+        """Identical agents get a one-token warm-up call before the fan-out."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a", "b"],
+            config_conversations=[
+                {"id": "cc", "type": "concurrent", "agents": ["a", "b"]}
+            ],
+        )
+        kernel = MagicMock()
+        calls = []
+        for agent in agents.values():
+            agent.kernel = kernel
+            agent.instructions = "Same prompt"
+
+            async def fake_invoke(messages=None, thread=None, arguments=None, _name=agent.name):
+                calls.append((_name, arguments))
+                yield "ok"
+
+            agent.invoke = fake_invoke
+
+        await runner.run("test", conversation_id="cc")
+        assert len(calls) == 3
+        warm_settings = calls[0][1].execution_settings["default"]
+        assert warm_settings.extension_data["max_tokens"] == 1
+
+        calls.clear()
+        await runner.run("other", conversation_id="cc", options={"prefix_warm": False})
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("shared_service,expected_calls", [(True, 3), (False, 2)])
+    async def test_run_concurrent_warms_agents_on_one_model(
+        self, shared_service, expected_calls
+    ):
+        """Top-level agents have their own kernels but share the model's service."""
+        from semantic_kernel import Kernel
+        from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
+
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a", "b"],
+            config_conversations=[
+                {"id": "cc", "type": "concurrent", "agents": ["a", "b"]}
+            ],
+        )
+
+        def make_service():
+            return OpenAIChatCompletion(
+                ai_model_id="v1", api_key="test", service_id="m1"
+            )
+
+        service = make_service()
+        calls = []
+        for agent in agents.values():
+            agent.kernel = Kernel()
+            agent.kernel.add_service(service if shared_service else make_service())
+            agent.instructions = "Same prompt"
+
+            async def fake_invoke(messages=None, thread=None, arguments=None):
+                calls.append(arguments)
+                yield "ok"
+
+            agent.invoke = fake_invoke
+
+        await runner.run("test", conversation_id="cc")
+
+        assert len(calls) == expected_calls
+
+    @pytest.mark.asyncio
+    async def test_group_chat_step_falls_back_to_role(self):
+        runner, _ = self._make_runner_with_agents(
+            agent_names=["a"],
+            config_conversations=[{"id": "gc", "type": "group_chat", "agents": ["a"]}],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                yield ChatMessageContent(role=AuthorRole.ASSISTANT, content="hi")
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            result = await runner.run("test", conversation_id="gc")
+
+        assert result["steps"] == [{"agent": "assistant", "content": "hi"}]
+
+    @pytest.mark.asyncio
+    async def test_group_chat_without_agents_fails_before_building_chat(self):
+        runner, _ = self._make_runner_with_agents(agent_names=["a"])
+        conv = ConversationConfig(id="mg", type="magentic", agents=["a"])
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            with pytest.raises(ValueError, match="No agents available"):
+                await runner._run_group_chat("test", [], conv, 3)
+
+        MockChat.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_on_step_sees_group_chat_steps_before_completion(self):
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a", "b"],
+            config_conversations=[
+                {"id": "gc", "type": "group_chat", "agents": ["a", "b"], "max_rounds": 2}
+            ],
+        )
+        finished = []
+        seen = []
+
+        def on_step(step):
+            seen.append((step, bool(finished)))
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                for name in ("sk-agent-a", "sk-agent-b"):
+                    msg = MagicMock(content=f"from {name}")
+                    msg.name = name
+                    yield msg
+                finished.append(True)
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            await runner.run("test", conversation_id="gc", options={"on_step": on_step})
+
+        assert seen[0] == ({"agent": "sk-agent-a", "content": "from sk-agent-a"}, False)
+        assert [step["agent"] for step, _ in seen] == ["sk-agent-a", "sk-agent-b"]
+        assert finished
+
+    @pytest.mark.asyncio
+    async def test_run_with_max_rounds_override(self):
+        """Options can override max_rounds."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a"],
+            config_conversations=[
+                {
+                    "id": "gc",
+                    "description": "Test",
+                    "type": "group_chat",
+                    "agents": ["a"],
+                    "max_rounds": 6,
+                }
+            ],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
+            "sk_conversations.DefaultTerminationStrategy"
+        ) as MockTermination:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                return
+                yield
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            await runner.run("test", conversation_id="gc", options={"max_rounds": 20})
+
+            call_kwargs = MockTermination.call_args.kwargs
+            assert call_kwargs["maximum_iterations"] == 20
+
+    @pytest.mark.asyncio
+    async def test_run_magentic_tries_kernel_function_selection(self):
+        """Magentic conversation tries KernelFunctionSelectionStrategy."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["researcher", "synthesizer"],
+            config_conversations=[
+                {
+                    "id": "mag-conv",
+                    "description": "Magentic test",
+                    "type": "magentic",
+                    "agents": ["researcher", "synthesizer"],
+                }
+            ],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
+            "sk_conversations.KernelFunctionSelectionStrategy"
+        ) as MockKFS, patch(
+            "sk_conversations.KernelFunctionFromPrompt"
+        ) as MockKFP:
+            MockKFS.return_value = MagicMock()
+            MockKFP.return_value = MagicMock()
+
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                return
+                yield
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            await runner.run("test", conversation_id="mag-conv")
+
+            # Verify KernelFunctionSelectionStrategy was attempted
+            MockKFS.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_deep_search_uses_preset_route(self):
+        """deep-search agents take turns in pipeline order without the LLM manager."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["critic", "researcher", "synthesizer"],
+            config_conversations=[
+                {
+                    "id": "deep-search",
+                    "type": "magentic",
+                    "agents": ["critic", "researcher", "synthesizer"],
+                    "termination_marker": "APPROVED",
+                    "termination_agent": "critic",
+                }
+            ],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
+            "sk_conversations.KernelFunctionSelectionStrategy"
+        ) as MockKFS:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                return
+                yield
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            await runner.run("test", conversation_id="deep-search")
+
+            MockKFS.assert_not_called()
+            assert MockChat.call_args.kwargs["agents"] == [
+                agents["researcher"],
+                agents["synthesizer"],
+                agents["critic"],
+            ]
+
+        termination = MockChat.call_args.kwargs["termination_strategy"]
+        assert isinstance(termination, MarkerTerminationStrategy)
+        assert termination.agents == [agents["critic"]]
+
+    @pytest.mark.asyncio
+    async def test_marker_termination_checks_last_message(self):
+        strategy = MarkerTerminationStrategy(marker="APPROVED")
+        history = [ChatMessageContent(role=AuthorRole.ASSISTANT, content="Needs work")]
+
+        assert await strategy.should_agent_terminate(None, []) is False
+        assert await strategy.should_agent_terminate(None, history) is False
+        history.append(ChatMessageContent(role=AuthorRole.ASSISTANT, content="APPROVED."))
+        assert await strategy.should_agent_terminate(None, history) is True
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "content,done",
+        [
+            ("  **APPROVED** - solid sources", True),
+            ("NOT APPROVED: the citations are missing", False),
+            ("This cannot be APPROVED yet.", False),
+            ("APPROVEDISH", False),
+        ],
+    )
+    async def test_marker_termination_needs_leading_marker(self, content, done):
+        strategy = MarkerTerminationStrategy(marker="APPROVED")
+        history = [ChatMessageContent(role=AuthorRole.ASSISTANT, content=content)]
+
+        assert await strategy.should_agent_terminate(None, history) is done
+
+    @pytest.mark.asyncio
+    async def test_magentic_selection_function_built_once(self):
+        """Repeated magentic runs reuse the compiled selection function."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["researcher", "synthesizer"],
+            config_conversations=[
+                {
+                    "id": "mag-conv",
+                    "description": "Magentic test",
+                    "type": "magentic",
+                    "agents": ["researcher", "synthesizer"],
+                }
+            ],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat, patch(
+            "sk_conversations.KernelFunctionSelectionStrategy"
+        ) as MockKFS, patch(
+            "sk_conversations.KernelFunctionFromPrompt"
+        ) as MockKFP:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                return
+                yield
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            await runner.run("first", conversation_id="mag-conv")
+            await runner.run("second", conversation_id="mag-conv")
+
+            MockKFP.assert_called_once()
+            # Strategies hold per-run state, so each run gets its own
+            assert MockKFS.call_count == 2
+            for call in MockKFS.call_args_list:
+                assert call.kwargs["function"] is MockKFP.return_value
+
+    @pytest.mark.asyncio
+    async def test_run_handles_agent_exception(self):
+        """Conversation returns error dict when agent raises."""
+        runner, agents = self._make_runner_with_agents(
+            agent_names=["a"],
+            config_conversations=[
+                {
+                    "id": "fail-conv",
+                    "description": "Failing",
+                    "type": "group_chat",
+                    "agents": ["a"],
+                }
+            ],
+        )
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            MockChat.side_effect = Exception("SK initialization error")
+
+            result = await runner.run("test", conversation_id="fail-conv")
+
+            assert "error" in result
+            assert "SK initialization error" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_run_with_inline_agents(self):
+        """Conversations with inline agents create agents on the fly."""
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "base", "model": "m1"}],
+            default_agent="base",
+            conversations=[
+                {
+                    "id": "inline-conv",
+                    "description": "With inline",
+                    "type": "sequential",
+                    "agents": ["inline-a", "inline-b"],
+                    "inline_agents": [
+                        {
+                            "id": "inline-a",
+                            "model": "m1",
+                            "system_prompt": "You are A.",
+                        },
+                        {
+                            "id": "inline-b",
+                            "model": "m1",
+                            "system_prompt": "You are B.",
+                        },
+                    ],
+                }
+            ],
+        )
+
+        mock_kernel = MagicMock()
+        mock_base = MagicMock(spec=ChatCompletionAgent)
+        mock_base.name = "sk-agent-base"
+        mock_base.kernel = mock_kernel
+
+        runner = ConversationRunner(config, {"base": mock_base})
 
         with patch("sk_conversations.ChatCompletionAgent") as MockAgent, patch(
             "sk_conversations.AgentGroupChat"
@@ -1577,6 +2114,404 @@ class TestConversationExecution:
                 assert agent.kernel is mock_kernel
 
 
+# ---------------------------------------------------------------------------
+# Response Cache Tests
+# ---------------------------------------------------------------------------
+
+
+class TestResponseCache:
+    """Tests for the conversation response cache."""
+
+    @pytest.mark.asyncio
+    async def test_exact_match_is_scoped(self):
+        cache = ResponseCache()
+        await cache.put(("conv", 10), "What is SK?", {"response": "cached"})
+
+        assert (await cache.get(("conv", 10), "What is SK?"))["response"] == "cached"
+        assert await cache.get(("conv", 5), "What is SK?") is None
+        assert await cache.get(("other", 10), "What is SK?") is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_match_uses_threshold(self):
+        vectors = {
+            "What is SK?": [1.0, 0.0],
+            "Explain SK": [0.99, 0.14],
+            "Unrelated": [0.0, 1.0],
+        }
+
+        async def embed(text):
+            return vectors[text]
+
+        cache = ResponseCache(embed=embed)
+        _, vector = await cache.lookup("conv", "What is SK?", 0.9)
+        await cache.put("conv", "What is SK?", {"response": "cached"}, vector)
+
+        assert await cache.get("conv", "Explain SK") is None
+        assert (await cache.get("conv", "Explain SK", 0.9))["response"] == "cached"
+        assert await cache.get("conv", "Unrelated", 0.9) is None
+
+    @pytest.mark.asyncio
+    async def test_keys_hold_prompt_digest_not_prompt(self):
+        cache = ResponseCache()
+        prompt = "long prompt " * 1000
+        await cache.put("conv", prompt, {"response": "cached"})
+
+        (scope, digest), = cache._entries
+        assert scope == "conv"
+        assert isinstance(digest, bytes) and len(digest) == 16
+        assert (await cache.get("conv", prompt))["response"] == "cached"
+
+    @pytest.mark.asyncio
+    async def test_evicts_oldest_entry(self):
+        cache = ResponseCache(max_entries=1)
+        await cache.put("conv", "first", {"response": "1"})
+        await cache.put("conv", "second", {"response": "2"})
+
+        assert await cache.get("conv", "first") is None
+        assert await cache.get("conv", "second") is not None
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        cache = ResponseCache(ttl=60)
+        with patch("sk_conversations.time.monotonic", return_value=100.0):
+            await cache.put("conv", "prompt", {"response": "cached"})
+        with patch("sk_conversations.time.monotonic", return_value=159.0):
+            assert await cache.get("conv", "prompt") is not None
+        with patch("sk_conversations.time.monotonic", return_value=161.0):
+            assert await cache.get("conv", "prompt") is None
+        assert not cache._entries
+
+    @pytest.mark.asyncio
+    async def test_hits_return_copies(self):
+        cache = ResponseCache()
+        result = {"response": "cached", "steps": [{"response": "cached"}]}
+        await cache.put("conv", "prompt", result)
+        result["steps"].append({"response": "late"})
+
+        hit = await cache.get("conv", "prompt")
+        hit["steps"].clear()
+
+        again = await cache.get("conv", "prompt")
+        assert again["steps"] == [{"response": "cached"}]
+
+    @pytest.mark.asyncio
+    async def test_lookup_vector_is_reused_by_put(self):
+        embed = AsyncMock(return_value=[1.0, 0.0])
+        cache = ResponseCache(embed=embed)
+
+        cached, vector = await cache.lookup("conv", "prompt", 0.9)
+        await cache.put("conv", "prompt", {"response": "r"}, vector)
+
+        assert cached is None
+        embed.assert_awaited_once_with("prompt")
+
+    def _cache_runner(self, cache=None, **conversation):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a", "model": "m1"}],
+            conversations=[
+                {
+                    "id": "gc",
+                    "type": "group_chat",
+                    "agents": ["a"],
+                    "max_rounds": 2,
+                    **conversation,
+                }
+            ],
+        )
+        agent = MagicMock(spec=ChatCompletionAgent)
+        agent.name = "sk-agent-a"
+        return ConversationRunner(
+            config, {"a": agent}, response_cache=cache or ResponseCache()
+        )
+
+    @staticmethod
+    def _patch_group_chat(MockChat, content="Answer"):
+        mock_chat_instance = MagicMock()
+
+        async def fake_invoke():
+            msg = MagicMock(content=content)
+            msg.name = "sk-agent-a"
+            yield msg
+
+        mock_chat_instance.invoke = fake_invoke
+        mock_chat_instance.add_chat_message = AsyncMock()
+        MockChat.return_value = mock_chat_instance
+
+    @pytest.mark.asyncio
+    async def test_run_prompts_differing_by_identifier_do_not_collide(self):
+        """Near-identical embeddings only match when the conversation opts in."""
+        cache = ResponseCache(embed=AsyncMock(return_value=[1.0, 0.0]))
+        default = self._cache_runner(cache)
+        opted_in = self._cache_runner(
+            ResponseCache(embed=cache._embed), cache_threshold=0.9
+        )
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            self._patch_group_chat(MockChat)
+            await default.run("Review PR #41", conversation_id="gc")
+            other = await default.run("Review PR #42", conversation_id="gc")
+            await opted_in.run("Review PR #41", conversation_id="gc")
+            paraphrase = await opted_in.run("Review PR #42", conversation_id="gc")
+
+        assert other["cache_hit"] is False
+        assert paraphrase["cache_hit"] is True
+        assert MockChat.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_run_does_not_cache_empty_response(self):
+        runner = self._cache_runner()
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            self._patch_group_chat(MockChat, content="")
+            first = await runner.run("test", conversation_id="gc")
+            second = await runner.run("test", conversation_id="gc")
+
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is False
+        assert MockChat.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_does_not_cache_partly_failed_concurrent_run(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "ok", "model": "m1"}, {"id": "limited", "model": "m1"}],
+            conversations=[
+                {"id": "cc", "type": "concurrent", "agents": ["ok", "limited"]}
+            ],
+        )
+        agents = {}
+        for name in ("ok", "limited"):
+            agent = MagicMock(spec=ChatCompletionAgent)
+            agent.name = f"sk-agent-{name}"
+            agent.kernel = MagicMock()
+
+            async def fake_invoke(messages=None, thread=None, _name=name):
+                if _name == "limited":
+                    raise RuntimeError("quota exhausted")
+                yield "Answer"
+
+            agent.invoke = fake_invoke
+            agents[name] = agent
+        runner = ConversationRunner(config, agents, response_cache=ResponseCache())
+        options = {"prefix_warm": False, "max_retries": 0}
+
+        first = await runner.run("test", conversation_id="cc", options=dict(options))
+        second = await runner.run("test", conversation_id="cc", options=dict(options))
+
+        assert [("error" in s) for s in first["steps"]] == [False, True]
+        assert first["response"]
+        assert second["cache_hit"] is False
+
+    @pytest.mark.asyncio
+    async def test_run_scope_includes_step_options(self):
+        runner = self._cache_runner()
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            self._patch_group_chat(MockChat)
+            await runner.run("test", conversation_id="gc")
+            trimmed = await runner.run(
+                "test", conversation_id="gc", options={"keep_last_n": 1}
+            )
+
+        assert trimmed["cache_hit"] is False
+        assert MockChat.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_hit_skips_callbacks(self):
+        runner = self._cache_runner()
+        on_step = MagicMock()
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            self._patch_group_chat(MockChat)
+            await runner.run("test", conversation_id="gc")
+            hit = await runner.run(
+                "test", conversation_id="gc", options={"on_step": on_step}
+            )
+
+        assert hit["cache_hit"] is True
+        on_step.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_serves_repeated_prompt_from_cache(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a", "model": "m1"}],
+            conversations=[
+                {"id": "gc", "type": "group_chat", "agents": ["a"], "max_rounds": 2}
+            ],
+        )
+        agent = MagicMock(spec=ChatCompletionAgent)
+        agent.name = "sk-agent-a"
+        runner = ConversationRunner(config, {"a": agent}, response_cache=ResponseCache())
+
+        with patch("sk_conversations.AgentGroupChat") as MockChat:
+            mock_chat_instance = MagicMock()
+
+            async def fake_invoke():
+                msg = MagicMock(content="Answer")
+                msg.name = "sk-agent-a"
+                yield msg
+
+            mock_chat_instance.invoke = fake_invoke
+            mock_chat_instance.add_chat_message = AsyncMock()
+            MockChat.return_value = mock_chat_instance
+
+            first = await runner.run("test", conversation_id="gc")
+            second = await runner.run("test", conversation_id="gc")
+            bypass = await runner.run("test", conversation_id="gc", options={"cache": False})
+
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert second["response"] == "Answer"
+        assert "cache_hit" not in bypass
+        assert MockChat.call_count == 2
+
+
+class TestRunConversationTool:
+    """Tests for the run_conversation MCP tool."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    async def test_result_serialized_as_utf8_json(self, has_orjson):
+        if has_orjson and not sk_agent.HAS_ORJSON:
+            pytest.skip("orjson not installed")
+        result = {"response": "Résumé", "steps": [{"agent": "assistant", "content": "é"}]}
+        runner = MagicMock()
+        runner.run = AsyncMock(return_value=result)
+
+        with patch("sk_agent._get_conversation_runner", AsyncMock(return_value=runner)), \
+                patch("sk_agent.HAS_ORJSON", has_orjson):
+            output = await sk_agent.run_conversation("test")
+
+        assert "Résumé" in output
+        assert json.loads(output) == result
+
+    @pytest.mark.asyncio
+    async def test_steps_reported_to_client(self):
+        steps = [
+            {"agent": "sk-agent-a", "content": "x" * 1000},
+            {"agent": "sk-agent-b", "error": "boom"},
+        ]
+
+        async def fake_run(prompt, conversation_id=None, options=None):
+            for step in steps:
+                await options["on_step"](step)
+            return {"response": "done", "steps": steps}
+
+        runner = MagicMock()
+        runner.run = AsyncMock(side_effect=fake_run)
+        ctx = MagicMock(report_progress=AsyncMock(), info=AsyncMock())
+
+        with patch("sk_agent._get_conversation_runner", AsyncMock(return_value=runner)):
+            output = await sk_agent.run_conversation("test", options='{"max_rounds": 2}', ctx=ctx)
+
+        assert json.loads(output)["response"] == "done"
+        options = runner.run.call_args.kwargs["options"]
+        assert options["max_rounds"] == 2
+        assert options["on_result"] is options["on_step"]
+        assert [c.args for c in ctx.report_progress.await_args_list] == [(1,), (2,)]
+        messages = [c.args[0] for c in ctx.info.await_args_list]
+        assert messages[0] == "[sk-agent-a] " + "x" * sk_agent._STEP_PREVIEW_CHARS
+        assert messages[1] == "[sk-agent-b] boom"
+
+    @pytest.mark.asyncio
+    async def test_step_report_failure_does_not_interrupt(self):
+        ctx = MagicMock(report_progress=AsyncMock(side_effect=RuntimeError("closed")))
+        report = sk_agent._step_reporter(ctx)
+
+        await report({"agent": "a", "content": "hi"})
+
+    def test_context_hidden_from_tool_schema(self):
+        tool = sk_agent.mcp_server._tool_manager.get_tool("run_conversation")
+
+        assert "ctx" not in tool.parameters["properties"]
+
+
+class TestRequestScopedToolCache:
+    """Tests for sharing tool results between concurrent agents."""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_run_once(self):
+        from semantic_kernel import Kernel
+        from semantic_kernel.filters import FilterTypes
+        from semantic_kernel.functions import kernel_function
+
+        calls = []
+
+        class Search:
+            @kernel_function(name="search")
+            async def search(self, query: str) -> str:
+                calls.append(query)
+                await asyncio.sleep(0.01)
+                return f"results for {query}"
+
+        kernels = [Kernel(), Kernel()]
+        cache = RequestScopedToolCache()
+        for kernel in kernels:
+            kernel.add_plugin(Search(), "web")
+            kernel.add_filter(FilterTypes.FUNCTION_INVOCATION, cache)
+
+        results = await asyncio.gather(
+            kernels[0].invoke(plugin_name="web", function_name="search", query="sk"),
+            kernels[1].invoke(plugin_name="web", function_name="search", query="sk"),
+            kernels[1].invoke(plugin_name="web", function_name="search", query="mcp"),
+        )
+
+        assert [str(r) for r in results] == [
+            "results for sk",
+            "results for sk",
+            "results for mcp",
+        ]
+        assert sorted(calls) == ["mcp", "sk"]
+
+    @pytest.mark.asyncio
+    async def test_overlapping_conversations_keep_separate_caches(self):
+        from semantic_kernel import Kernel
+        from semantic_kernel.functions import kernel_function
+
+        calls = []
+
+        class Search:
+            @kernel_function(name="search")
+            async def search(self, query: str) -> str:
+                calls.append(query)
+                result = f"call {len(calls)}"
+                await asyncio.sleep(0.01)
+                return result
+
+        kernel = Kernel()
+        kernel.add_plugin(Search(), "web")
+        agents = {}
+        for name in ("a", "b"):
+            agent = MagicMock(spec=ChatCompletionAgent)
+            agent.name = f"sk-agent-{name}"
+            agent.kernel = kernel
+
+            async def fake_invoke(messages=None, thread=None):
+                yield await kernel.invoke(
+                    plugin_name="web", function_name="search", query="sk"
+                )
+
+            agent.invoke = fake_invoke
+            agents[name] = agent
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": name, "model": "m1"} for name in agents],
+            conversations=[{"id": "cc", "type": "concurrent", "agents": ["a", "b"]}],
+        )
+        runner = ConversationRunner(config, agents)
+        options = {"prefix_warm": False}
+
+        first, second = await asyncio.gather(
+            runner.run("one", conversation_id="cc", options=dict(options)),
+            runner.run("two", conversation_id="cc", options=dict(options)),
+        )
+
+        assert len(calls) == 2
+        first_results = {s["response"] for s in first["steps"]}
+        second_results = {s["response"] for s in second["steps"]}
+        assert len(first_results) == len(second_results) == 1
+        assert first_results != second_results
+        assert len(kernel.function_invocation_filters) == 1
+
+
 # ---------------------------------------------------------------------------
 # Dynamic Description Mutation Tests
 # ---------------------------------------------------------------------------
@@ -1587,8 +2522,6 @@ class TestDynamicDescriptionMutation:
 
     def test_fastmcp_tool_description_can_be_mutated(self):
         """Verify FastMCP Tool.description field is mutable."""
-        from mcp.server.fastmcp import FastMCP
-
         server = FastMCP("test-mutation")
 
         @server.tool()
@@ -1717,6 +2650,14 @@ class TestConversationPresets:
         assert "deep-think" in PRESETS
         assert PRESETS["deep-think"] is DEEP_THINK_PRESET
 
+    def test_presets_are_read_only(self):
+        import dataclasses
+
+        with pytest.raises(TypeError):
+            PRESETS["deep-search"] = DEEP_THINK_PRESET
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            DEEP_SEARCH_PRESET.max_rounds = 1
+
     def test_deep_search_has_correct_agents(self):
         assert DEEP_SEARCH_PRESET.agents == ["researcher", "synthesizer", "critic"]
         assert DEEP_SEARCH_PRESET.type == "magentic"
@@ -1767,6 +2708,22 @@ class TestConversationRunner:
         for conv in convs:
             assert conv.get("builtin") is True
 
+    def test_list_conversations_built_once(self):
+        runner = self._make_runner()
+        convs = runner.list_conversations()
+        convs.clear()
+
+        again = runner.list_conversations()
+        assert again
+        assert again[0] is runner.list_conversations()[0]
+
+    def test_list_conversations_does_not_share_config_agents(self):
+        runner = self._make_runner()
+        listed = next(c for c in runner.list_conversations() if c["id"] == "deep-search")
+        listed["agents"].append("intruder")
+
+        assert "intruder" not in PRESETS["deep-search"].agents
+
     def test_list_conversations_includes_config_conversations(self):
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
@@ -1843,6 +2800,25 @@ class TestConversationRunner:
         assert "error" in result
         assert "no agents" in result["error"].lower()
 
+    @pytest.mark.asyncio
+    async def test_run_failure_logs_traceback_only_at_debug(self, caplog):
+        agent = MagicMock(spec=ChatCompletionAgent)
+        agent.name = "sk-agent-a1"
+        runner = self._make_runner(sk_agents={"a1": agent})
+        conv = ConversationConfig(id="gc", type="group_chat", agents=["a1"])
+        runner._conversations = {"gc": conv}
+
+        with patch.object(runner, "_run_group_chat", side_effect=RuntimeError("boom")):
+            with caplog.at_level(logging.INFO, logger="sk-agent.conversations"):
+                result = await runner.run("test", conversation_id="gc")
+            assert result == {"error": "boom"}
+            assert not caplog.records[-1].exc_info
+
+            caplog.clear()
+            with caplog.at_level(logging.DEBUG, logger="sk-agent.conversations"):
+                await runner.run("test", conversation_id="gc", options={"cache": False})
+            assert caplog.records[-1].exc_info
+
 
 class TestConversationDescriptionBuilder:
     """Tests for build_run_conversation_description."""
@@ -1900,24 +2876,36 @@ class TestConversationDescriptionBuilder:
         assert len(conv_lines) == 1
         assert "Overridden" in conv_lines[0]
 
+    def test_description_reused_for_same_config(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a1", "model": "m1"}],
+        )
+        other = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a1", "model": "m1"}],
+            conversations=[{"id": "new-conv", "type": "sequential", "agents": ["a1"]}],
+        )
+
+        assert build_run_conversation_description(config) is build_run_conversation_description(config)
+        assert "new-conv" in build_run_conversation_description(other)
+
 
 class TestConversationInlineAgents:
     """Tests for inline agent resolution in conversations."""
 
     def test_inline_agent_creation_reuses_kernel(self):
         """Inline agents should reuse existing agent kernels."""
-        runner = ConversationRunner.__new__(ConversationRunner)
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
             agents=[{"id": "a1", "model": "m1"}],
         )
-        runner.config = config
 
         # Create a mock SK agent with a mock kernel
         mock_kernel = MagicMock()
         mock_agent = MagicMock()
         mock_agent.kernel = mock_kernel
-        runner.sk_agents = {"a1": mock_agent}
+        runner = ConversationRunner(config, {"a1": mock_agent})
 
         inline_cfg = AgentConfig(
             id="inline-test",
@@ -1936,6 +2924,43 @@ class TestConversationInlineAgents:
             assert call_kwargs.kwargs["kernel"] is mock_kernel
             assert "inline-test" in call_kwargs.kwargs["name"]
 
+    def test_inline_agent_reused_across_runs(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a1", "model": "m1"}],
+        )
+        runner = ConversationRunner(config, {"a1": MagicMock(kernel=MagicMock())})
+        inline_cfg = AgentConfig(id="inline", model="m1", system_prompt="Be brief.")
+
+        with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
+            MockAgent.side_effect = lambda **kw: MagicMock(**kw)
+            first = runner._create_inline_agent(inline_cfg)
+            second = runner._create_inline_agent(inline_cfg)
+            changed = runner._create_inline_agent(
+                AgentConfig(id="inline", model="m1", system_prompt="Be thorough.")
+            )
+
+        assert first is second
+        assert changed is not first
+        assert MockAgent.call_count == 2
+
+    def test_inline_agent_kernel_index_sees_new_agents(self):
+        """Agents created lazily after the first lookup are indexed too."""
+        config = make_v2_config(
+            models=[
+                {"id": "m1", "base_url": "http://test", "model_id": "v1"},
+                {"id": "m2", "base_url": "http://test", "model_id": "v2"},
+            ],
+            agents=[{"id": "a1", "model": "m1"}, {"id": "a2", "model": "m2"}],
+        )
+        sk_agents = {"a1": MagicMock(kernel=MagicMock())}
+        runner = ConversationRunner(config, sk_agents)
+
+        assert runner._kernel_for_model("m2") is sk_agents["a1"].kernel
+
+        sk_agents["a2"] = MagicMock(kernel=MagicMock())
+        assert runner._kernel_for_model("m2") is sk_agents["a2"].kernel
+
     def test_inline_agent_uses_default_model_when_empty(self):
         """Inline agent with empty model uses default agent's model."""
         config = make_v2_config(
@@ -1944,13 +2969,11 @@ class TestConversationInlineAgents:
             default_agent="a1",
         )
 
-        runner = ConversationRunner.__new__(ConversationRunner)
-        runner.config = config
 
         mock_kernel = MagicMock()
         mock_agent = MagicMock()
         mock_agent.kernel = mock_kernel
-        runner.sk_agents = {"a1": mock_agent}
+        runner = ConversationRunner(config, {"a1": mock_agent})
 
         inline_cfg = AgentConfig(
             id="no-model-agent",
@@ -1979,7 +3002,8 @@ class TestSharedAgentResolutionPriority:
     picked up by the ConversationRunner.
     """
 
-    def test_top_level_agent_preferred_over_inline(self):
+    @pytest.mark.asyncio
+    async def test_top_level_agent_preferred_over_inline(self):
         """Top-level SK agent is used when both top-level and inline exist with same ID."""
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
@@ -1998,9 +3022,7 @@ class TestSharedAgentResolutionPriority:
         mock_top_level_agent.name = "sk-researcher"
         mock_top_level_agent.kernel = MagicMock()
 
-        runner = ConversationRunner.__new__(ConversationRunner)
-        runner.config = config
-        runner.sk_agents = {"researcher": mock_top_level_agent}
+        runner = ConversationRunner(config, {"researcher": mock_top_level_agent})
 
         # Create conversation config with inline agent that has same ID
         conv = ConversationConfig(
@@ -2019,12 +3041,13 @@ class TestSharedAgentResolutionPriority:
             ],
         )
 
-        resolved = runner._resolve_conversation_agents(conv)
+        resolved = await runner._resolve_conversation_agents(conv)
         assert len(resolved) == 1
         # Must be the top-level mock, not a newly created inline agent
         assert resolved[0] is mock_top_level_agent
 
-    def test_inline_agent_used_when_no_top_level(self):
+    @pytest.mark.asyncio
+    async def test_inline_agent_used_when_no_top_level(self):
         """Inline agent is used as fallback when no top-level agent exists."""
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
@@ -2035,9 +3058,7 @@ class TestSharedAgentResolutionPriority:
         mock_other = MagicMock(spec=ChatCompletionAgent)
         mock_other.kernel = MagicMock()
 
-        runner = ConversationRunner.__new__(ConversationRunner)
-        runner.config = config
-        runner.sk_agents = {"other-agent": mock_other}
+        runner = ConversationRunner(config, {"other-agent": mock_other})
 
         conv = ConversationConfig(
             id="test-conv",
@@ -2058,12 +3079,13 @@ class TestSharedAgentResolutionPriority:
         with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
             mock_created = MagicMock()
             MockAgent.return_value = mock_created
-            resolved = runner._resolve_conversation_agents(conv)
+            resolved = await runner._resolve_conversation_agents(conv)
             assert len(resolved) == 1
             # Must be the newly created inline agent
             assert resolved[0] is mock_created
 
-    def test_mixed_resolution_top_level_and_inline(self):
+    @pytest.mark.asyncio
+    async def test_mixed_resolution_top_level_and_inline(self):
         """Conversation with mix of top-level and inline-only agents resolves both."""
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
@@ -2075,9 +3097,7 @@ class TestSharedAgentResolutionPriority:
         mock_shared.name = "sk-shared-agent"
         mock_shared.kernel = MagicMock()
 
-        runner = ConversationRunner.__new__(ConversationRunner)
-        runner.config = config
-        runner.sk_agents = {"shared-agent": mock_shared}
+        runner = ConversationRunner(config, {"shared-agent": mock_shared})
 
         conv = ConversationConfig(
             id="mixed-conv",
@@ -2098,21 +3118,20 @@ class TestSharedAgentResolutionPriority:
         with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
             mock_inline = MagicMock()
             MockAgent.return_value = mock_inline
-            resolved = runner._resolve_conversation_agents(conv)
+            resolved = await runner._resolve_conversation_agents(conv)
             assert len(resolved) == 2
             assert resolved[0] is mock_shared  # top-level
             assert resolved[1] is mock_inline  # inline fallback
 
-    def test_unresolvable_agent_skipped_with_warning(self):
+    @pytest.mark.asyncio
+    async def test_unresolvable_agent_skipped_with_warning(self):
         """Agent ID that exists neither top-level nor inline is skipped."""
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
             agents=[{"id": "a1", "model": "m1"}],
         )
 
-        runner = ConversationRunner.__new__(ConversationRunner)
-        runner.config = config
-        runner.sk_agents = {"a1": MagicMock(spec=ChatCompletionAgent)}
+        runner = ConversationRunner(config, {"a1": MagicMock(spec=ChatCompletionAgent)})
 
         conv = ConversationConfig(
             id="test",
@@ -2122,9 +3141,50 @@ class TestSharedAgentResolutionPriority:
             max_rounds=1,
         )
 
-        resolved = runner._resolve_conversation_agents(conv)
+        resolved = await runner._resolve_conversation_agents(conv)
         assert len(resolved) == 0  # skipped, not crashed
 
+    @pytest.mark.asyncio
+    async def test_all_initialized_agents_skip_factory(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a1", "model": "m1"}, {"id": "a2", "model": "m1"}],
+        )
+        sk_agents = {"a1": MagicMock(), "a2": MagicMock()}
+        factory = AsyncMock()
+        runner = ConversationRunner(config, sk_agents, agent_factory=factory)
+        conv = ConversationConfig(id="test", agents=["a2", "a1"])
+
+        resolved = await runner._resolve_conversation_agents(conv)
+
+        assert resolved == [sk_agents["a2"], sk_agents["a1"]]
+        factory.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_inline_only_agents_skip_factory_across_runs(self):
+        config = make_v2_config(
+            models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
+            agents=[{"id": "a1", "model": "m1"}],
+        )
+        factory = AsyncMock(return_value=None)
+        runner = ConversationRunner(
+            config, {"a1": MagicMock(kernel=MagicMock())}, agent_factory=factory
+        )
+        conv = ConversationConfig(
+            id="test",
+            agents=["a1", "helper"],
+            inline_agents=[AgentConfig(id="helper", model="m1")],
+        )
+
+        with patch("sk_conversations.ChatCompletionAgent") as MockAgent:
+            MockAgent.side_effect = lambda **kw: MagicMock(**kw)
+            first = await runner._resolve_conversation_agents(conv)
+            second = await runner._resolve_conversation_agents(conv)
+
+        assert first[1] is second[1]
+        MockAgent.assert_called_once()
+        factory.assert_not_awaited()
+
 
 class TestSharedConversationAgentConfig:
     """Tests that shared conversation agents in config/presets are well-formed."""
@@ -2226,7 +3286,8 @@ class TestSharedConversationAgentConfig:
         assert agent_id == "critic"
         assert sk_agent_obj is mock_critic
 
-    def test_config_conversations_reference_shared_agents(self):
+    @pytest.mark.asyncio
+    async def test_config_conversations_reference_shared_agents(self):
         """Config conversations (no inline_agents) resolve via shared top-level agents."""
         config = make_v2_config(
             models=[{"id": "m1", "base_url": "http://test", "model_id": "v1"}],
@@ -2261,7 +3322,7 @@ class TestSharedConversationAgentConfig:
         assert conv is not None
         assert conv.id == "deep-search"
 
-        resolved = runner._resolve_conversation_agents(conv)
+        resolved = await runner._resolve_conversation_agents(conv)
         assert len(resolved) == 3
         assert resolved[0] is mock_agents["researcher"]
         assert resolved[1] is mock_agents["synthesizer"]